@@ -0,0 +1,239 @@
+"""
+Reproducible benchmarks of orbit exploration, hashing and LC-equivalence.
+Run with python -m gsc.benchmarks [--output FILE] [--baseline FILE].
+"""
+# Python packages
+import sys
+import json
+import random
+import argparse
+import platform
+import subprocess
+import tracemalloc
+import numpy as np
+import networkx as nx
+from time import perf_counter
+# Local modules
+from gsc.graph_builders import (
+    linear_graph,
+    square_lattice,
+    random_connected_graph,
+    create_prime_graph,
+)
+from gsc.psuedo_graphs import (
+    gen_psuedo_graph_edge_map,
+    create_psuedo_graph,
+    psuedo_to_real,
+)
+from gsc.get_nauty import hash_graph, find_rep_nodes
+from gsc.is_lc_equiv import are_lc_equiv
+from gsc.explore_lc_orbit import explore_lc_orbit, qubit_LC
+from gsc.search_tracing import SearchMetrics
+
+
+def ring_graph(n):
+    """ Returns a ring of n nodes, closing the linear graph """
+    g = linear_graph(n)
+    g.add_edge((n - 1, 0), (0, 0))
+    return g
+
+
+def random_graphs(n, count):
+    """ Returns count random connected graphs on n nodes """
+    return [random_connected_graph(n) for _ in range(count)]
+
+
+def prime_power_graph(c_edges, prime, power):
+    """ Returns the prime-power graph of a pseudo graph """
+    c_map = gen_psuedo_graph_edge_map(prime, power)
+    return psuedo_to_real(create_psuedo_graph(c_edges, prime, power, c_map))
+
+
+def lc_equiv_pairs(n, count, n_ops=10):
+    """ Returns count pairs of random graphs on n nodes and LC-equivalents """
+    pairs = []
+    for graph in random_graphs(n, count):
+        lc_graph = graph
+        for _ in range(n_ops):
+            lc_graph = qubit_LC(lc_graph, random.choice(list(lc_graph)))
+        pairs.append((graph, lc_graph))
+    return pairs
+
+
+def orbit_case(graph):
+    """ Returns a benchmark exploring the orbit of graph """
+    graph = nx.convert_node_labels_to_integers(graph) \
+        if graph.__dict__.get('power', 1) == 1 else graph
+
+    def run():
+        metrics = SearchMetrics()
+        class_graph = explore_lc_orbit(graph, verbose=False, metrics=metrics)
+        counts = metrics.counts
+        # Counts the certificates of children and the orbits of members
+        return {'members': len(class_graph),
+                'nauty_calls': counts['certificates'] + counts['expanded']}
+    return run
+
+
+def import_time(module):
+    """
+    Returns the time taken to import module in a fresh interpreter and which
+    of the optional dependencies in LAZY_MODULES it imported
+    """
+    code = ('import sys, json\n'
+            'from time import perf_counter\n'
+            'start = perf_counter()\n'
+            'import %s\n'
+            'print(json.dumps([perf_counter() - start, [m for m in %r '
+            'if m in sys.modules]]))' % (module, LAZY_MODULES))
+    output = subprocess.check_output([sys.executable, '-c', code])
+    return tuple(json.loads(output.decode()))
+
+
+def import_case(module):
+    """ Returns a benchmark importing module in a fresh interpreter """
+    def run():
+        seconds, loaded = import_time(module)
+        return {'import_time': seconds, 'lazy_modules_loaded': loaded}
+    return run
+
+
+def graphs_case(func, graphs):
+    """ Returns a benchmark applying func to each of graphs """
+    def run():
+        for graph in graphs:
+            func(*graph) if isinstance(graph, tuple) else func(graph)
+        return {'graphs': len(graphs)}
+    return run
+
+
+# Optional dependencies that importing the search should not load, and the
+# time budget (in seconds) for importing it
+LAZY_MODULES = ('abp', 'sympy', 'tqdm', 'concurrent.futures.process',
+                'cProfile')
+IMPORT_BUDGET = 1.0
+# Builds each case's input from a fixed seed, returning its benchmark
+CASES = [
+    ('import_explore_lc_orbit',
+     lambda: import_case('gsc.explore_lc_orbit')),
+    ('orbit_linear_9', lambda: orbit_case(linear_graph(9))),
+    ('orbit_ring_10', lambda: orbit_case(ring_graph(10))),
+    ('orbit_square_lattice_3x3', lambda: orbit_case(square_lattice(3, 3))),
+    ('orbit_random_8', lambda: orbit_case(random_connected_graph(8))),
+    ('orbit_prime_p5_path_5', lambda: orbit_case(create_prime_graph(
+        [(0, 1, 1), (1, 2, 2), (2, 3, 3), (3, 4, 4)], 5))),
+    ('orbit_prime_power_p2_m2_3', lambda: orbit_case(prime_power_graph(
+        [(0, 1, 15), (1, 2, 7)], 2, 2))),
+    ('hash_graph_random_16', lambda: graphs_case(
+        hash_graph, random_graphs(16, 100))),
+    ('find_rep_nodes_random_16', lambda: graphs_case(
+        find_rep_nodes, random_graphs(16, 100))),
+    ('are_lc_equiv_random_10', lambda: graphs_case(
+        are_lc_equiv, lc_equiv_pairs(10, 10))),
+]
+QUICK_CASES = ['import_explore_lc_orbit', 'orbit_linear_9',
+               'hash_graph_random_16']
+
+
+def run_case(build, seed=0, repeat=3):
+    """
+    Runs a benchmark built from seed repeat times, returning the fastest
+    wall time, the peak memory of a further traced run and the run's counts
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    run = build()
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        result = run()
+        times.append(perf_counter() - start)
+    tracemalloc.start()
+    run()
+    result['peak_memory'] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    result['wall_time'] = min(times)
+    if 'members' in result:
+        result['members_per_second'] = result['members'] / result['wall_time']
+        result['nauty_calls_per_member'] = \
+            result['nauty_calls'] / float(result['members'])
+    return result
+
+
+def run_benchmarks(names=None, seed=0, repeat=3):
+    """ Runs the named benchmarks (by default all) and returns the results """
+    names = [name for name, _ in CASES] if names is None else names
+    builds = dict(CASES)
+    return {'meta': {'python': platform.python_version(),
+                     'platform': platform.platform(),
+                     'networkx': nx.__version__, 'numpy': np.__version__,
+                     'seed': seed, 'repeat': repeat},
+            'results': {name: run_case(builds[name], seed, repeat)
+                        for name in names}}
+
+
+def compare_results(results, baseline, threshold=1.25):
+    """
+    Compares the wall time and peak memory of each benchmark against a
+    baseline, returning rows of the benchmark, metric, baseline and current
+    values, their ratio and whether it exceeds threshold
+    """
+    rows = []
+    for name, result in sorted(results['results'].items()):
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        for metric in ('wall_time', 'peak_memory'):
+            ratio = result[metric] / base[metric] if base[metric] else 1.0
+            rows.append((name, metric, base[metric], result[metric], ratio,
+                         ratio > threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--output', help="file to write results to as JSON")
+    parser.add_argument('--baseline', help="results file to compare against")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="ratio to baseline counted as a regression")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quick', action='store_true',
+                        help="only run a small subset of benchmarks")
+    parser.add_argument('names', nargs='*', help="benchmarks to run")
+    args = parser.parse_args(argv)
+    names = args.names or (QUICK_CASES if args.quick else None)
+    results = run_benchmarks(names, args.seed, args.repeat)
+    for name, result in results['results'].items():
+        print('%-28s %9.4fs %10d B' %
+              (name, result['wall_time'], result['peak_memory']) +
+              ('  %8.0f members/s  %5.2f nauty calls/member' %
+               (result['members_per_second'],
+                result['nauty_calls_per_member'])
+               if 'members' in result else '') +
+              ('  %.4fs import' % result['import_time']
+               if 'import_time' in result else ''))
+    # Counts importing slower than the budget as a regression
+    over_budget = [name for name, result in results['results'].items()
+                   if result.get('import_time', 0) > IMPORT_BUDGET]
+    for name in over_budget:
+        print('%-28s import over budget of %.2fs' % (name, IMPORT_BUDGET))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if not args.baseline:
+        return 1 if over_budget else 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = 0
+    for name, metric, base, current, ratio, regressed in \
+            compare_results(results, baseline, args.threshold):
+        print('%-28s %-12s %12.4g -> %12.4g (x%.2f)%s' %
+              (name, metric, base, current, ratio,
+               '  REGRESSION' if regressed else ''))
+        regressions += regressed
+    return 1 if regressions or over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+# Python packages
+import networkx as nx
+
+
+def to_bit_graph(graph, nodes=None):
+    """
+    Converts a NetworkX qubit graph into a bit graph, i.e. a tuple of integer
+    adjacency masks where bit j of row i is set iff nodes i and j are adjacent.
+    Nodes are indexed by their position in nodes (default graph.nodes()).
+    """
+    nodes = list(graph.nodes()) if nodes is None else list(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    rows = [0] * len(nodes)
+    for u, v in graph.edges():
+        i, j = index[u], index[v]
+        rows[i] |= 1 << j
+        rows[j] |= 1 << i
+    return tuple(rows)
+
+
+def from_bit_graph(bit_g, nodes=None):
+    """ Converts a bit graph into a NetworkX graph with unit edge weights """
+    nodes = list(range(len(bit_g))) if nodes is None else list(nodes)
+    graph = nx.Graph()
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(((nodes[i], nodes[j]) for i, j
+                          in bit_graph_edges(bit_g)), weight=1)
+    return graph
+
+
+def bit_neighbors(bit_g, node):
+    """ Returns the neighbours of node in ascending order """
+    row = bit_g[node]
+    neighs = []
+    while row:
+        low = row & -row
+        neighs.append(low.bit_length() - 1)
+        row ^= low
+    return neighs
+
+
+def bit_degree(bit_g, node):
+    """ Returns the degree of node """
+    return bin(bit_g[node]).count('1')
+
+
+def bit_graph_edges(bit_g):
+    """ Returns the edges (i, j) with i < j in lexicographic order """
+    return [(i, j) for i in range(len(bit_g))
+            for j in bit_neighbors(bit_g, i) if j > i]
+
+
+def bit_qubit_LC(bit_g, node):
+    """
+    Returns the bit graph for local complementation applied to node, i.e.
+    XORs the neighbourhood mask into the row of each neighbour
+    """
+    mask = bit_g[node]
+    rows = list(bit_g)
+    for u in bit_neighbors(bit_g, node):
+        rows[u] ^= mask & ~(1 << u)
+    return tuple(rows)
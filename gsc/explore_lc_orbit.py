@@ -1,14 +1,45 @@
 # Python packages
 import os
-import sys
 import csv
 import json
+import time
+import heapq
+from time import perf_counter
 import networkx as nx
 import itertools as it
+from functools import partial
+from collections import deque
 from networkx.readwrite import json_graph
 # Local modules
-from gsc.utils import copy_graph
-from gsc.get_nauty import find_rep_nodes, hash_graph
+from gsc.utils import copy_graph, copy_graph_attrs, LRUCache
+from gsc.get_nauty import (
+    find_rep_nodes,
+    find_isomorphism,
+    CertificateCollisionError,
+    certificate_digest,
+    certificate_key,
+    graph_certificate,
+    nauty_graph,
+)
+from gsc.bit_graphs import (
+    to_bit_graph,
+    from_bit_graph,
+    bit_graph_edges,
+    bit_qubit_LC,
+)
+from gsc.qudit_graphs import (
+    QuditGraph,
+    graph_attr,
+    qudit_LC,
+    qudit_EM,
+    qudit_CC,
+    qudit_LC_EM_children,
+    qudit_CC_EM_children,
+)
+from gsc.member_codes import MemberCodec, MemberData
+from gsc.orbit_store import OrbitStore
+from gsc.product_orbits import ProductOrbit
+from gsc.search_tracing import timed, VerboseTracer
 
 
 def init_EC_database_dir(directory='EC_database'):
@@ -19,6 +50,8 @@ def init_EC_database_dir(directory='EC_database'):
 
 def qubit_LC(graph, node, copy=True):
     """ Returns the graph for local complementation applied to node """
+    if isinstance(graph, QuditGraph):
+        return qudit_LC(graph, node, 1, copy)
     neighs = graph.neighbors(node)
     neigh_k_edges = it.combinations(neighs, 2)
     lc_graph = copy_graph(graph) if copy else graph
@@ -32,7 +65,8 @@ def qubit_LC(graph, node, copy=True):
 
 def apply_qubit_LCs(graph, nodes):
     """ Applies a sequence of local complementations """
-    lc_graph = copy_graph(graph)
+    lc_graph = graph.copy() if isinstance(graph, QuditGraph) \
+        else copy_graph(graph)
     for node in nodes:
         lc_graph = qubit_LC(lc_graph, node, copy=False)
     return lc_graph
@@ -50,6 +84,8 @@ def prime_qudit_LC(graph, node, a, copy=True):
     Returns the graph for generalised local complementation applied to
     node n with weight a
     """
+    if isinstance(graph, QuditGraph):
+        return qudit_LC(graph, node, a, copy)
     p = graph.prime
     neighs = list(graph.neighbors(node))
     neigh_k_edges = it.combinations(neighs, 2)
@@ -74,6 +110,8 @@ def prime_qudit_EM(graph, node, b, copy=True):
     Returns the graph for edge multiplication operation applied on node n
     with weight b
     """
+    if isinstance(graph, QuditGraph):
+        return qudit_EM(graph, node, b, copy)
     em_graph = copy_graph(graph) if copy else graph
     p = graph.prime
     neighs = em_graph.neighbors(node)
@@ -88,19 +126,19 @@ def prime_qudit_EM(graph, node, b, copy=True):
 
 
 def make_LC_a(a):
-    def lc_a(graph, node):
-        return prime_qudit_LC(graph, node, a)
-    return lc_a
+    """ Generalised local complementation function generator """
+    return partial(prime_qudit_LC, a=a)
 
 
 def make_EM_b(b):
-    def em_b(graph, node):
-        return prime_qudit_EM(graph, node, b)
-    return em_b
+    """ Edge multiplication function generator """
+    return partial(prime_qudit_EM, b=b)
 
 
 def prime_power_qudit_CC(graph, node, t, a, copy=True):
     """ Returns graph after controlled complementation """
+    if isinstance(graph, QuditGraph):
+        return qudit_CC(graph, node, t, a, copy)
     # Creates new graph if needed
     new_graph = copy_graph(graph) if copy else graph
     n, c = node
@@ -118,73 +156,514 @@ def prime_power_qudit_CC(graph, node, t, a, copy=True):
 
 def make_pp_CC_a(a, t):
     """ Controlled complementation function generator """
-    def cc_a(graph, node):
-        return prime_power_qudit_CC(graph, node, t, a)
-    return cc_a
+    return partial(prime_power_qudit_CC, t=t, a=a)
 
 
-def queued_orbit_search(init_graph, local_ops, save_edges, verbose):
-    # Initialises class graph with init_graph
-    init_edges = list(init_graph.edges())
-    init_hash = hash_graph(init_graph)
-    class_graph = nx.Graph()
-    class_graph.add_node(0, nx_graph=init_graph,
-                         edges=init_edges, hash=init_hash)
-    class_graph.member_hash_table = {init_hash: 0}
-    # Loops over queue members until empty
-    queue = [0]
-    visited = 0
-    while queue:
-        # Prints live count of explored/known
-        if verbose:
-            out = \
-                str(visited) + '/' + str(len(queue) + visited) + ' visited (' \
-                + str(int(100 * float(visited)/(len(queue) + visited))) + '%)'
-            sys.stdout.write('%s\r' % out)
-            sys.stdout.flush()
-        visited += 1
-        # Gets next graph on queue and finds representative nodes
-        graph_label = queue.pop()
-        graph = class_graph.nodes[graph_label]['nx_graph']
-        node_equivs = find_rep_nodes(graph)
-        # Applies set of local ops to each representative node
-        for rep_node, equiv_nodes in node_equivs.items():
-            for op_label, local_op in local_ops:
-                new_graph = local_op(graph, rep_node)
-                new_edges = list(new_graph.edges())
-                new_hash = hash_graph(new_graph)
-                # Checks new graph is difference to original
-                if sorted(new_graph.edges(data='weight')) == \
-                        sorted(graph.edges(data='weight')):
+def graph_key(graph):
+    """ Returns a hashable key identifying the labelled graph """
+    if isinstance(graph, tuple):
+        return graph
+    if isinstance(graph, QuditGraph):
+        return graph.key()
+    return tuple(sorted(graph.edges(data='weight')))
+
+
+def apply_local_ops(graph, node, local_ops, skip=None):
+    """
+    Yields the op label and graph for each of local_ops applied to node.
+    An entry of local_ops may also be a batch of ops, given by a tuple of op
+    labels and a function returning the graphs for all of them at once,
+    with None for any known to leave the graph unchanged. The op labelled
+    skip is not applied and None is yielded in its place.
+    """
+    for op_label, local_op in local_ops:
+        if isinstance(op_label, tuple):
+            for batch_label, new_graph in zip(op_label, local_op(graph, node)):
+                yield batch_label, new_graph
+        elif op_label == skip:
+            yield op_label, None
+        else:
+            yield op_label, local_op(graph, node)
+
+
+def local_op_map(local_ops):
+    """ Maps each op label in local_ops to a function applying that op """
+    op_map = {}
+    for op_label, local_op in local_ops:
+        if isinstance(op_label, tuple):
+            for i, batch_label in enumerate(op_label):
+                op_map[batch_label] = partial(apply_batch_op, local_op, i)
+        else:
+            op_map[op_label] = local_op
+    return op_map
+
+
+def apply_batch_op(batch_op, i, graph, node):
+    """ Returns the ith graph of a batch of ops applied to node """
+    return batch_op(graph, node)[i]
+
+
+def expand_member(graph, local_ops, nauty_g=None, keep_nauty=False,
+                  cert_cache=None, inverse=None, metrics=None):
+    """
+    Applies local_ops to each representative node of graph and returns the
+    equivalent nodes, op label, graph, certificate and (if keep_nauty)
+    nauty_graph of every child that differs from graph. nauty_g optionally
+    gives the graph's own nauty_graph, so it need not be rebuilt.
+    cert_cache optionally maps graph keys to certificates, so that nauty is
+    only run on labelled graphs not seen before (whose nauty_graph is then
+    the only one kept).
+    inverse optionally gives the node and op label that map graph back to
+    the member it was found from. That op is not applied to the node's
+    equivalent nodes and its child is returned with graph, certificate and
+    nauty_graph None, meaning the parent.
+    metrics optionally gives the SearchMetrics to count and time phases in.
+    """
+    graph_id = graph_key(graph)
+    counts = None if metrics is None else metrics.counts
+    children = []
+    rep_nodes = timed(metrics, 'orbits', find_rep_nodes, graph, nauty_g)
+    for rep_node, equiv_nodes in rep_nodes.items():
+        skip = inverse[1] \
+            if inverse is not None and inverse[0] in equiv_nodes else None
+        new_graphs = timed(metrics, 'children', list, apply_local_ops(
+            graph, rep_node, local_ops, skip))
+        if counts is not None:
+            counts['children'] += len(new_graphs)
+        for op_label, new_graph in new_graphs:
+            # Returns the parent for the inverse op without applying it
+            if op_label == skip:
+                children.append((equiv_nodes, op_label, None, None, None))
+                if counts is not None:
+                    counts['inverse_children'] += 1
+                continue
+            # Checks new graph is difference to original
+            new_key = None if new_graph is None else graph_key(new_graph)
+            if new_key is None or new_key == graph_id:
+                if counts is not None:
+                    counts['noop_children'] += 1
+                continue
+            new_cert = None if cert_cache is None else cert_cache.get(new_key)
+            new_nauty_g = None
+            if new_cert is None:
+                start = perf_counter()
+                new_nauty_g = nauty_graph(new_graph)
+                new_cert = graph_certificate(new_graph, new_nauty_g)
+                if cert_cache is not None:
+                    cert_cache[new_key] = new_cert
+                if counts is not None:
+                    metrics.times['certificates'] += perf_counter() - start
+                    counts['certificates'] += 1
+            elif counts is not None:
+                counts['cert_cache_hits'] += 1
+            children.append((equiv_nodes, op_label, new_graph, new_cert,
+                             new_nauty_g if keep_nauty else None))
+    if counts is not None:
+        counts['expanded'] += 1
+    return children
+
+
+def expand_members(graphs, local_ops, inverses=None):
+    """ Expands a batch of class members (see expand_member) """
+    inverses = inverses or [None] * len(graphs)
+    return [expand_member(graph, local_ops, inverse=inverse)
+            for graph, inverse in zip(graphs, inverses)]
+
+
+def process_pool(workers):
+    """ Returns a pool of workers processes, or None if fewer than two """
+    if workers < 2:
+        return None
+    # Imports on first use, as multiprocessing is slow to import
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(workers)
+
+
+def member_inverse(equiv_nodes, op_label, invert_op):
+    """
+    Returns the node and op label mapping a child found by op_label on
+    equiv_nodes back to its parent, or None if there is no such op
+    """
+    if invert_op is None:
+        return None
+    inverse_label = invert_op(op_label)
+    return None if inverse_label is None else (equiv_nodes[0], inverse_label)
+
+
+def add_member(class_graph, label, graph, graph_hash):
+    """ Adds a member to the class graph, encoding it if compact """
+    codec = class_graph.graph.get('codec')
+    if codec is None:
+        class_graph.add_node(label, graph=graph, hash=graph_hash)
+    else:
+        class_graph.add_node(label, hash=graph_hash)
+        class_graph.nodes[label].code = codec.encode(graph)
+
+
+def get_member_graph(class_graph, label):
+    """ Returns the search graph of a class graph member """
+    codec = class_graph.graph.get('codec')
+    if codec is None:
+        return class_graph.nodes[label]['graph']
+    return codec.decode(class_graph.nodes[label].code)
+
+
+def prefetch_expansions(pool, upcoming, get_graph, local_ops, expansions,
+                        max_batches, batch_size, get_inverse=None):
+    """
+    Submits batches of upcoming queue members (ordered with the next to pop
+    first) to the process pool for expansion until max_batches are running.
+    expansions maps each submitted member to its batch future and position.
+    get_inverse optionally gives each member's inverse (see expand_member).
+    """
+    running = set(future for future, _ in expansions.values()
+                  if not future.done())
+    upcoming = iter(upcoming)
+    top = next(upcoming)
+    unsubmitted = (label for label in it.chain([top], upcoming)
+                   if label not in expansions)
+    # Always submits the top of the queue as it is needed next
+    while len(running) < max_batches or top not in expansions:
+        labels = list(it.islice(unsubmitted, batch_size))
+        if not labels:
+            break
+        graphs = [get_graph(label) for label in labels]
+        inverses = None if get_inverse is None \
+            else [get_inverse(label) for label in labels]
+        future = pool.submit(expand_members, graphs, local_ops, inverses)
+        expansions.update({label: (future, i)
+                           for i, label in enumerate(labels)})
+        running.add(future)
+
+
+def add_link(class_graph, source, target, equiv_nodes, op_label):
+    """ Adds a local op to the link between two class graph members """
+    # If new edge adds new edge between members
+    if not class_graph.has_edge(source, target):
+        class_graph.add_edge(source, target, equivs=[equiv_nodes],
+                             ops=[op_label])
+    # Else adds any new local ops to edge label
+    elif op_label not in class_graph[source][target]['ops']:
+        class_graph[source][target]['ops'].append(op_label)
+        class_graph[source][target]['equivs'].append(equiv_nodes)
+
+
+def verify_certificate(class_graph, graph_hash, cert):
+    """
+    Checks cert against the stored certificate of the member with the same
+    digest, raising a CertificateCollisionError if they differ
+    """
+    if class_graph.member_cert_table[graph_hash] != certificate_key(cert):
+        raise CertificateCollisionError(
+            "Distinct graph certificates with digest %032x" % graph_hash)
+
+
+def queued_orbit_search(init_graph, local_ops, save_edges, verbose,
+                        workers=1, batch_size=32, codec=None, verify=False,
+                        nauty_cache_size=1024, cert_cache_size=2 ** 16,
+                        invert_op=None, max_depth=None, max_members=None,
+                        time_limit=None, cancel=None, class_graph=None,
+                        metrics=None, tracer=None):
+    """
+    Explores the orbit of init_graph under local_ops up to isomorphism.
+    Graphs may be NetworkX graphs, QuditGraphs or bit graphs. local_ops must
+    act on the same kind of graph and, for QuditGraphs and bit graphs, the
+    equivalent nodes in link data are node indices.
+    If workers > 1, queue members are expanded in batches by a process pool
+    while the class graph is built here in the same order as the serial
+    search, so both return identical class graphs.
+    If a MemberCodec is given, members are stored as compact codes instead.
+    If verify, members' full certificates are kept and checked whenever a
+    child's digest matches a member.
+    The PyNauty graphs built for the certificates of the last
+    nauty_cache_size new members are kept to find their orbits when popped,
+    and serial searches keep the certificates of the cert_cache_size most
+    recently seen labelled graphs to skip nauty for repeated children.
+    invert_op optionally maps an op label to the label of the op undoing it
+    (or None), so that members are linked back to the member they were
+    found from without applying that op.
+    The search stops early once at least max_members are known, after
+    time_limit seconds, once cancel() returns True or, if max_depth is
+    given, once all unexpanded members are max_depth local ops from
+    init_graph (members are then expanded breadth first). The unexpanded
+    members are marked with 'expanded' False and their labels and depths
+    kept, in queue order, in the class graph's 'frontier'. Passing such a
+    class graph (with its members' search graphs and node indices in link
+    data) continues its search.
+    metrics optionally gives the SearchMetrics to count and time the search
+    phases in (expansions by workers are not measured) and tracer a
+    SearchTracer to report progress to, as well as any verbose output.
+    """
+    # Starts process pool for parallel expansions
+    pool = process_pool(workers)
+    expansions = {}
+    cert_cache = LRUCache(cert_cache_size) \
+        if pool is None and cert_cache_size else None
+    if class_graph is None:
+        # Initialises class graph with init_graph
+        init_nauty_g = nauty_graph(init_graph)
+        init_cert = graph_certificate(init_graph, init_nauty_g)
+        init_hash = certificate_digest(init_cert)
+        class_graph = nx.Graph()
+        if codec is not None:
+            class_graph.graph['codec'] = codec
+            class_graph.node_attr_dict_factory = partial(MemberData, codec)
+        add_member(class_graph, 0, init_graph, init_hash)
+        class_graph.member_hash_table = {init_hash: 0}
+        if verify:
+            class_graph.member_cert_table = \
+                {init_hash: certificate_key(init_cert)}
+        nauty_cache = {0: init_nauty_g} if pool is None else {}
+        if cert_cache is not None:
+            cert_cache[graph_key(init_graph)] = init_cert
+        frontier = [(0, 0)]
+    else:
+        # Continues from the frontier of a partial search
+        nauty_cache = {}
+        frontier = class_graph.graph.pop('frontier')
+        for label, _ in frontier:
+            del class_graph.nodes[label]['expanded']
+    # Maps queued members to their parent and the op mapping them back to it
+    parents, inverses = {}, {}
+    # Loops over queue members until empty, tracking their depths
+    queue = deque(label for label, _ in frontier)
+    depths = dict(frontier)
+    pop = queue.popleft if max_depth is not None else queue.pop
+    start = time.time()
+    visited = class_graph.number_of_nodes() - len(queue)
+    tracers = ([VerboseTracer()] if verbose else []) + \
+        ([tracer] if tracer is not None else [])
+    for search_tracer in tracers:
+        search_tracer.start()
+    counts = None if metrics is None else metrics.counts
+    try:
+        while queue:
+            # Stops early once any budget is spent
+            if (max_members is not None and
+                    class_graph.number_of_nodes() >= max_members) or \
+                    (time_limit is not None and
+                     time.time() - start >= time_limit) or \
+                    (cancel is not None and cancel()) or \
+                    (max_depth is not None and
+                     depths[queue[0]] >= max_depth):
+                break
+            # Reports live count of explored/known
+            for search_tracer in tracers:
+                search_tracer.progress(visited, len(queue) + visited, metrics)
+            visited += 1
+            # Gets children of next graph on queue
+            if pool is not None:
+                prefetch_expansions(pool, queue if max_depth is not None
+                                    else reversed(queue),
+                                    partial(get_member_graph, class_graph),
+                                    local_ops, expansions, 2 * workers,
+                                    batch_size, inverses.get)
+            graph_label = pop()
+            depth = depths.pop(graph_label)
+            parent = parents.pop(graph_label, None)
+            inverse = inverses.pop(graph_label, None)
+            if pool is not None:
+                future, i = expansions.pop(graph_label)
+                children = future.result()[i]
+            else:
+                graph = get_member_graph(class_graph, graph_label)
+                children = expand_member(graph, local_ops,
+                                         nauty_cache.pop(graph_label, None),
+                                         keep_nauty=nauty_cache_size > 0,
+                                         cert_cache=cert_cache,
+                                         inverse=inverse, metrics=metrics)
+            # Adds each child to the class graph
+            for equiv_nodes, op_label, new_graph, new_cert, new_nauty_g \
+                    in children:
+                # Links inverse ops straight back to the parent
+                if new_graph is None:
+                    if save_edges:
+                        add_link(class_graph, graph_label, parent,
+                                 equiv_nodes, op_label)
                     continue
-                # If different, tries to find new graph in class
+                new_hash = certificate_digest(new_cert)
+                # Tries to find new graph in class
                 try:
                     old_label = class_graph.member_hash_table[new_hash]
+                    if verify:
+                        verify_certificate(class_graph, new_hash, new_cert)
                     if save_edges:
-                        # If new edge adds new edge between members
-                        if not class_graph.has_edge(graph_label, old_label):
-                            class_graph.add_edge(graph_label, old_label,
-                                                 equivs=[equiv_nodes],
-                                                 ops=[op_label])
-                        # Else adds any new local ops to edge label
-                        elif op_label not in \
-                                class_graph[graph_label][old_label]['ops']:
-                            class_graph[graph_label][old_label]['ops']\
-                                .append(op_label)
-                            class_graph[graph_label][old_label]['equivs']\
-                                .append(equiv_nodes)
+                        add_link(class_graph, graph_label, old_label,
+                                 equiv_nodes, op_label)
+                    if counts is not None:
+                        counts['dedup_hits'] += 1
                     continue
                 # If not in class, creates new class graph node
                 except KeyError:
-                    new_label = max(class_graph.nodes()) + 1
-                    class_graph.add_node(new_label, nx_graph=new_graph,
-                                         edges=new_edges, hash=new_hash)
+                    if counts is not None:
+                        counts['dedup_misses'] += 1
+                    new_label = class_graph.number_of_nodes()
+                    add_member(class_graph, new_label, new_graph, new_hash)
                     if save_edges:
                         class_graph.add_edge(graph_label, new_label,
                                              equivs=[equiv_nodes],
                                              ops=[op_label])
-                    class_graph.member_hash_table.update({new_hash: new_label})
+                    class_graph.member_hash_table.update(
+                        {new_hash: new_label})
+                    if verify:
+                        class_graph.member_cert_table[new_hash] = \
+                            certificate_key(new_cert)
+                    # Caches new member's PyNauty graph, evicting the oldest
+                    if new_nauty_g is not None:
+                        nauty_cache[new_label] = new_nauty_g
+                        if len(nauty_cache) > nauty_cache_size:
+                            del nauty_cache[next(iter(nauty_cache))]
+                    # Records the op mapping new member back to this one
+                    inverse = member_inverse(equiv_nodes, op_label, invert_op)
+                    if inverse is not None:
+                        parents[new_label] = graph_label
+                        inverses[new_label] = inverse
+                    depths[new_label] = depth + 1
                     queue.append(new_label)
+    finally:
+        if pool is not None:
+            for future, _ in expansions.values():
+                future.cancel()
+            pool.shutdown()
+    for search_tracer in tracers:
+        search_tracer.finish(visited, len(queue) + visited, metrics)
+    # Marks any unexpanded members left by stopping early
+    if queue:
+        class_graph.graph['frontier'] = [(label, depths[label])
+                                         for label in queue]
+        for label in queue:
+            class_graph.nodes[label]['expanded'] = False
+    return class_graph
+
+
+def stored_orbit_search(init_graph, local_ops, save_edges, verbose, codec,
+                        directory, workers=1, batch_size=32,
+                        checkpoint_every=1000, cert_cache_size=2 ** 16,
+                        invert_op=None, metrics=None, tracer=None):
+    """
+    Explores the orbit as queued_orbit_search but keeps the members, queue
+    and links in an OrbitStore in directory rather than in memory, making a
+    checkpoint every checkpoint_every expanded members. Restarting with the
+    same directory resumes from the last checkpoint. Returns the store.
+    Serial searches skip nauty for the cert_cache_size most recently seen
+    labelled graphs and invert_op links members found since (re)starting
+    back to their parent, and metrics and tracer measure and report the
+    search, as in queued_orbit_search.
+    """
+    # Opens store and adds init_graph if new
+    search = (codec.nodes, codec.encode(init_graph),
+              [op_label for op_label, _ in local_ops], save_edges)
+    store = OrbitStore(directory, search)
+    if not len(store):
+        init_hash = certificate_digest(graph_certificate(init_graph))
+        store.add_member(init_hash, codec.encode(init_graph))
+        store.checkpoint()
+    # Starts process pool for parallel expansions
+    pool = process_pool(workers)
+    expansions = {}
+    cert_cache = LRUCache(cert_cache_size) \
+        if pool is None and cert_cache_size else None
+    parents, inverses = {}, {}
+
+    def get_graph(label):
+        return codec.decode(store.get_code(label))
+    # Loops over unexpanded members until none remain
+    visited, known = store.n_expanded(), len(store)
+    unsaved = 0
+    tracers = ([VerboseTracer()] if verbose else []) + \
+        ([tracer] if tracer is not None else [])
+    for search_tracer in tracers:
+        search_tracer.start()
+    counts = None if metrics is None else metrics.counts
+    try:
+        while True:
+            queue = store.pending(len(expansions) + 2 * workers * batch_size)
+            if not queue:
+                break
+            # Reports live count of explored/known
+            for search_tracer in tracers:
+                search_tracer.progress(visited, known, metrics)
+            visited += 1
+            # Gets children of next graph on queue
+            graph_label = queue[0]
+            if pool is not None:
+                prefetch_expansions(pool, queue, get_graph, local_ops,
+                                    expansions, 2 * workers, batch_size,
+                                    inverses.get)
+            parent = parents.pop(graph_label, None)
+            inverse = inverses.pop(graph_label, None)
+            if pool is not None:
+                future, i = expansions.pop(graph_label)
+                children = future.result()[i]
+            else:
+                children = expand_member(get_graph(graph_label), local_ops,
+                                         cert_cache=cert_cache,
+                                         inverse=inverse, metrics=metrics)
+            # Adds each child to the store
+            for equiv_nodes, op_label, new_graph, new_cert, _ in children:
+                # Links inverse ops straight back to the parent
+                if new_graph is None:
+                    if save_edges:
+                        store.add_link(graph_label, parent, equiv_nodes,
+                                       op_label)
+                    continue
+                new_hash = certificate_digest(new_cert)
+                new_label = store.find(new_hash)
+                if counts is not None:
+                    counts['dedup_hits' if new_label is not None
+                           else 'dedup_misses'] += 1
+                if new_label is None:
+                    new_label = store.add_member(new_hash,
+                                                 codec.encode(new_graph))
+                    known += 1
+                    # Records the op mapping new member back to this one
+                    inverse = member_inverse(equiv_nodes, op_label, invert_op)
+                    if inverse is not None:
+                        parents[new_label] = graph_label
+                        inverses[new_label] = inverse
+                if save_edges:
+                    store.add_link(graph_label, new_label, equiv_nodes,
+                                   op_label)
+            store.set_expanded(graph_label)
+            # Checkpoints periodically
+            unsaved += 1
+            if unsaved >= checkpoint_every:
+                store.checkpoint()
+                unsaved = 0
+        store.checkpoint()
+        for search_tracer in tracers:
+            search_tracer.finish(visited, known, metrics)
+    # Discards changes since the last checkpoint if interrupted
+    except BaseException:
+        store.close()
+        raise
+    finally:
+        if pool is not None:
+            for future, _ in expansions.values():
+                future.cancel()
+            pool.shutdown()
+    return store
+
+
+def load_class_graph(store, codec, compact=False):
+    """ Builds the class graph of an orbit search from its OrbitStore """
+    class_graph = nx.Graph()
+    if compact:
+        class_graph.graph['codec'] = codec
+        class_graph.node_attr_dict_factory = partial(MemberData, codec)
+    class_graph.member_hash_table = {}
+    if compact:
+        for label, graph_hash, code in store.members():
+            class_graph.add_node(label, hash=graph_hash)
+            class_graph.nodes[label].code = code
+            class_graph.member_hash_table[graph_hash] = label
+    else:
+        for label, graph_hash, code in store.members():
+            class_graph.add_node(label, graph=codec.decode(code),
+                                 hash=graph_hash)
+            class_graph.member_hash_table[graph_hash] = label
+    for source, target, ops, equivs in store.links():
+        class_graph.add_edge(source, target, ops=ops, equivs=equivs)
     return class_graph
 
 
@@ -198,39 +677,435 @@ def int_relabel_graph(graph):
     return int_graph, int_labels
 
 
-def explore_lc_orbit(init_graph, save_edges=True, verbose=True):
-    """ Explores the LC equivalence class orbit up to isomorphism """
+def init_orbit_search(init_graph):
+    """
+    Returns the NetworkX init_graph, its node list, whether its orbit is
+    searched on bit graphs, the local ops and the initial search graph
+    """
+    # Converts QuditGraphs at the API boundary
+    if isinstance(init_graph, QuditGraph):
+        init_graph = init_graph.to_nx()
     # Tries to get graph dimensions p^m. If not assigned assumes d = 2
-    p = init_graph.__dict__.get('prime', 2)
-    m = init_graph.__dict__.get('power', 1)
+    p = graph_attr(init_graph, 'prime', 2)
+    m = graph_attr(init_graph, 'power', 1)
     if m == 1 and not nx.is_connected(init_graph):
         raise TypeError("Initial graph must be connected.")
-    # Creates finite field for arithmetic and maps graph edge int weights
+    # Creates list of local operations accessible for search
+    nodes = list(init_graph.nodes())
+    bits = p == 2 and m == 1
     if m > 1:
-        # Creates list of local operations accessible for search
-        local_ops = [('CC%d(c,%d)' % (a, t), make_pp_CC_a(a, t))
+        # Generates all CC_a,t and EM_b children of a node in one batch
+        op_labels = ['CC%d(c,%d)' % (a, t)
                      for a in range(1, p) for t in range(m)]
-        local_ops += [('EM%d' % (b), make_EM_b(b))
-                      for b in range(2, p)]
-    elif p > 2 and m == 1:
-        local_ops = [('LC' + str(a), make_LC_a(a)) for a in range(1, p)]
-        local_ops += [('EM' + str(b), make_EM_b(b)) for b in range(2, p)]
+        op_labels += ['EM%d' % (b) for b in range(2, p)]
+        local_ops = [(tuple(op_labels), qudit_CC_EM_children)]
+    elif not bits:
+        # Generates all LC_a and EM_b children of a node in one batch
+        op_labels = ['LC' + str(a) for a in range(1, p)]
+        op_labels += ['EM' + str(b) for b in range(2, p)]
+        local_ops = [(tuple(op_labels), qudit_LC_EM_children)]
     else:
-        local_ops = [('LC', qubit_LC)]
+        local_ops = [('LC', bit_qubit_LC)]
+    # Qubit orbits are searched on bit graphs and qudit orbits on QuditGraphs
+    init_state = to_bit_graph(init_graph, nodes) if bits \
+        else QuditGraph.from_nx(init_graph)
+    return init_graph, nodes, bits, local_ops, init_state
+
+
+def member_edges(graph, nodes):
+    """ Returns the weighted edge list of a search graph """
+    if isinstance(graph, tuple):
+        return [(nodes[u], nodes[v], 1) for u, v in bit_graph_edges(graph)]
+    return graph.edges()
+
+
+def member_nx_graph(graph, init_graph, nodes):
+    """ Returns the NetworkX graph, with init_graph's attributes, of a search graph """
+    nx_graph = from_bit_graph(graph, nodes) if isinstance(graph, tuple) \
+        else graph.to_nx()
+    return copy_graph_attrs(init_graph, nx_graph)
+
+
+def explore_lc_orbit(init_graph, save_edges=True, verbose=True, workers=1,
+                     compact=False, directory=None, checkpoint_every=1000,
+                     verify=False, census=False, cache=None, max_depth=None,
+                     max_members=None, time_limit=None, cancel=None,
+                     resume=None, metrics=None, tracer=None):
+    """
+    Explores the LC equivalence class orbit up to isomorphism.
+    init_graph may be a NetworkX graph or a QuditGraph.
+    If census, returns only the orbit's lc_orbit_census, without building
+    the class graph.
+    If workers > 1, expands class members with that many processes.
+    If compact, stores each member as a packed upper-triangle code and only
+    rebuilds its nx_graph and edges when they are accessed.
+    If directory is given, the search is kept on disk there, checkpointed
+    every checkpoint_every members and resumed if restarted.
+    If verify, members are compared by full certificate as well as digest
+    (not supported with directory).
+    If cache (an OrbitCache) is given and already holds init_graph's orbit,
+    its class graph is returned relabelled to init_graph without searching.
+    Otherwise the orbit found (if save_edges) is added to the cache.
+    The orbit of a disconnected qubit or prime graph is returned as a
+    ProductOrbit of its components' orbits, each explored with the same
+    options.
+    The search stops early, returning a partial class graph, once
+    max_members are known, after time_limit seconds, once cancel() returns
+    True or once all unexpanded members are max_depth local ops from
+    init_graph (see queued_orbit_search). Its unexpanded members have
+    'expanded' False and it is continued (in place) by passing it as resume.
+    metrics optionally gives the SearchMetrics to count and time the search
+    phases in and tracer a SearchTracer to report progress to (see
+    gsc.search_tracing).
+    """
+    if isinstance(init_graph, QuditGraph):
+        init_graph = init_graph.to_nx()
+    bounded = resume is not None or \
+        any(bound is not None
+            for bound in (max_depth, max_members, time_limit, cancel))
+    if graph_attr(init_graph, 'power', 1) == 1 and init_graph and \
+            not nx.is_connected(init_graph):
+        if census or directory is not None or bounded:
+            raise ValueError("census, directory and bounds cannot be used "
+                             "with disconnected graphs")
+        return ProductOrbit.from_components(init_graph, partial(
+            explore_lc_orbit, save_edges=save_edges, verbose=verbose,
+            workers=workers, compact=compact, verify=verify, cache=cache,
+            metrics=metrics, tracer=tracer))
+    if bounded and (census or directory is not None):
+        raise ValueError("bounds cannot be combined with census or directory")
+    if verify and directory is not None:
+        raise ValueError("verify cannot be combined with directory")
+    if cache is not None and (census or compact or directory is not None):
+        raise ValueError("cache cannot be combined with census, compact or "
+                         "directory")
+    if census:
+        if workers > 1 or compact or directory is not None or \
+                metrics is not None or tracer is not None:
+            raise ValueError("census cannot be combined with workers, "
+                             "compact, directory, metrics or tracer")
+        return lc_orbit_census(init_graph)
+    init_graph, nodes, bits, local_ops, init_state = \
+        init_orbit_search(init_graph)
+    if resume is not None:
+        resume = unpack_class_graph(resume, init_state, nodes, bits, compact,
+                                    verify)
+    if cache is not None:
+        class_graph = cache.get(init_graph, save_edges)
+        if class_graph is not None:
+            return class_graph
+    codec = MemberCodec(init_graph, bits) \
+        if compact or directory is not None else None
+    invert_op = orbit_invert_op(init_graph)
     # Performs orbit search
-    class_graph = queued_orbit_search(init_graph, local_ops, save_edges,
-                                      verbose)
-    # Adds weighted edge data for qudit class graphs
-    for node, data in class_graph.nodes.data():
-        graph = data['nx_graph']
-        edges = data['edges']
-        if p ** m > 2:
-            data['edges'] = [(u, v, graph[u][v]['weight']) for u, v in edges]
-        else:
-            data['edges'] = [(u, v, 1) for u, v in edges]
+    if directory is not None:
+        store = stored_orbit_search(init_state, local_ops, save_edges,
+                                    verbose, codec, directory,
+                                    workers=workers,
+                                    checkpoint_every=checkpoint_every,
+                                    invert_op=invert_op, metrics=metrics,
+                                    tracer=tracer)
+        class_graph = load_class_graph(store, codec, compact=compact)
+        store.close()
+    else:
+        class_graph = queued_orbit_search(init_state, local_ops, save_edges,
+                                          verbose, workers=workers,
+                                          codec=codec, verify=verify,
+                                          invert_op=invert_op,
+                                          max_depth=max_depth,
+                                          max_members=max_members,
+                                          time_limit=time_limit,
+                                          cancel=cancel, class_graph=resume,
+                                          metrics=metrics, tracer=tracer)
+    # Builds NetworkX graphs and weighted edge data for class members
+    if not compact:
+        for node, data in class_graph.nodes.data():
+            graph = data.pop('graph')
+            data['nx_graph'] = member_nx_graph(graph, init_graph, nodes)
+            data['edges'] = member_edges(graph, nodes)
+    # Relabels node indices in edge data with node names
+    for _, _, data in class_graph.edges.data():
+        data['equivs'] = [[nodes[i] for i in equivs]
+                          for equivs in data['equivs']]
+    if cache is not None and save_edges and \
+            'frontier' not in class_graph.graph:
+        cache.add(class_graph, init_graph)
+    return class_graph
+
+
+def unpack_class_graph(class_graph, init_graph, nodes, bits, compact=False,
+                       verify=False):
+    """
+    Converts a partial class graph returned by explore_lc_orbit for the
+    search graph init_graph back into the one built by queued_orbit_search
+    """
+    if 'frontier' not in class_graph.graph:
+        raise ValueError("Class graph has no frontier to resume from")
+    if compact != ('codec' in class_graph.graph):
+        raise ValueError("Class graph must be resumed with the same compact")
+    if class_graph.nodes[0]['hash'] != \
+            certificate_digest(graph_certificate(init_graph)):
+        raise ValueError("Class graph is not of init_graph's orbit")
+    # Rebuilds the search graph of each member
+    if not compact:
+        for _, data in class_graph.nodes.data():
+            nx_graph = data.pop('nx_graph')
+            del data['edges']
+            data['graph'] = to_bit_graph(nx_graph, nodes) if bits \
+                else QuditGraph.from_nx(nx_graph)
+    # Relabels node names in edge data with node indices
+    index = {node: i for i, node in enumerate(nodes)}
+    for _, _, data in class_graph.edges.data():
+        data['equivs'] = [[index[node] for node in equivs]
+                          for equivs in data['equivs']]
+    if verify:
+        class_graph.member_cert_table = {
+            data['hash']: certificate_key(graph_certificate(
+                get_member_graph(class_graph, label)))
+            for label, data in class_graph.nodes.data()}
     return class_graph
 
 
+def iter_lc_orbit(init_graph, nx_graphs=False, cert_cache_size=2 ** 16):
+    """
+    Explores the LC equivalence class orbit up to isomorphism, yielding the
+    label and data of each member as soon as it is found. Labels match those
+    of explore_lc_orbit's class graph. Only member hashes and the unexpanded
+    members are kept, so the consumer may stop the search at any point.
+    Member data holds its 'edges' and 'hash', the 'parent' label, 'op' and
+    'equivs' that found it (None for init_graph) and, if nx_graphs, its
+    'nx_graph'. The certificates of the cert_cache_size most recently seen
+    labelled graphs are kept to skip nauty for repeated children.
+    """
+    init_graph, nodes, _, local_ops, init_state = \
+        init_orbit_search(init_graph)
+    invert_op = orbit_invert_op(init_graph)
+
+    def member_data(graph, graph_hash, parent=None, op=None, equivs=None):
+        data = {'edges': member_edges(graph, nodes), 'hash': graph_hash,
+                'parent': parent, 'op': op, 'equivs': equivs}
+        if nx_graphs:
+            data['nx_graph'] = member_nx_graph(graph, init_graph, nodes)
+        return data
+    init_cert = graph_certificate(init_state)
+    init_hash = certificate_digest(init_cert)
+    hashes = {init_hash}
+    cert_cache = LRUCache(cert_cache_size) if cert_cache_size else None
+    if cert_cache is not None:
+        cert_cache[graph_key(init_state)] = init_cert
+    yield 0, member_data(init_state, init_hash)
+    # Expands unexpanded members, most recently found first
+    frontier = [(0, init_state, None)]
+    while frontier:
+        label, graph, inverse = frontier.pop()
+        for equiv_nodes, op_label, new_graph, new_cert, _ \
+                in expand_member(graph, local_ops, cert_cache=cert_cache,
+                                 inverse=inverse):
+            # Skips inverse ops, which give back the parent
+            if new_graph is None:
+                continue
+            new_hash = certificate_digest(new_cert)
+            if new_hash in hashes:
+                continue
+            new_label = len(hashes)
+            hashes.add(new_hash)
+            yield new_label, member_data(new_graph, new_hash, label,
+                                         op_label,
+                                         [nodes[i] for i in equiv_nodes])
+            frontier.append((new_label, new_graph,
+                             member_inverse(equiv_nodes, op_label,
+                                            invert_op)))
+
+
+def lc_orbit_census(init_graph):
+    """
+    Returns the size, edge count histogram and minimum and maximum edge
+    representatives of the LC orbit of init_graph, computed online from
+    iter_lc_orbit so that only the current representatives are kept.
+    Representatives are keyed by label and hold their 'edges' and 'hash'.
+    """
+    size, edge_counts = 0, {}
+    min_edges = max_edges = None
+    min_edge_reps, max_edge_reps = {}, {}
+    for label, data in iter_lc_orbit(init_graph):
+        n_edges = len(data['edges'])
+        edge_counts[n_edges] = edge_counts.get(n_edges, 0) + 1
+        rep = {'edges': data['edges'], 'hash': data['hash']}
+        # Replaces representatives if member has fewer or more edges
+        if not size or n_edges < min_edges:
+            min_edges, min_edge_reps = n_edges, {}
+        if n_edges == min_edges:
+            min_edge_reps[label] = rep
+        if not size or n_edges > max_edges:
+            max_edges, max_edge_reps = n_edges, {}
+        if n_edges == max_edges:
+            max_edge_reps[label] = rep
+        size += 1
+    return {'size': size, 'edge_counts': dict(sorted(edge_counts.items())),
+            'min_edge_reps': min_edge_reps, 'max_edge_reps': max_edge_reps}
+
+
+def invert_op_label(op_label, p):
+    """ Returns the label of the local op inverting a qubit or qudit op """
+    if op_label == 'LC':
+        return op_label
+    a = int(op_label[2:])
+    if op_label.startswith('LC'):
+        return 'LC%d' % (p - a)
+    return 'EM%d' % pow(a, p - 2, p)
+
+
+def orbit_invert_op(init_graph):
+    """
+    Returns the function inverting the local op labels of init_graph's orbit
+    search, or None for prime-power graphs, whose CC ops have no single
+    inverse
+    """
+    if graph_attr(init_graph, 'power', 1) > 1:
+        return None
+    return partial(invert_op_label, p=graph_attr(init_graph, 'prime', 2))
+
+
+def apply_lc_path(graph, path):
+    """
+    Applies a sequence of (op label, node) local ops, as returned by
+    find_lc_path, to graph and returns the resulting NetworkX graph
+    """
+    graph, nodes, _, local_ops, state = init_orbit_search(graph)
+    local_ops = local_op_map(local_ops)
+    index = {node: i for i, node in enumerate(nodes)}
+    for op_label, node in path:
+        state = local_ops[op_label](state, index[node])
+    return member_nx_graph(state, graph, nodes)
+
+
+def find_lc_path(graph_a, graph_b):
+    """
+    Finds a shortest sequence of (op label, node) local ops that maps
+    graph_a to a graph isomorphic to graph_b, searching breadth-first up to
+    isomorphism from both graphs until their searches meet. Returns None if
+    the graphs are not equivalent. Prime-power graphs, whose local ops have
+    no single inverse op, are only searched from graph_a.
+    """
+    graph_a, nodes, _, local_ops, state_a = init_orbit_search(graph_a)
+    if isinstance(graph_b, QuditGraph):
+        graph_b = graph_b.to_nx()
+    dims = [(graph_attr(g, 'prime', 2), graph_attr(g, 'power', 1))
+            for g in (graph_a, graph_b)]
+    if dims[0] != dims[1] or graph_b.number_of_nodes() != len(nodes):
+        return None
+    p, m = dims[0]
+    # Steps found from graph_b are mapped onto graph_a's nodes where the
+    # searches meet, so graph_b keeps its own nodes
+    state_b = init_orbit_search(graph_b)[-1]
+    # Maps each member found from either graph to its parent, op and node
+    hashes = [certificate_digest(graph_certificate(state))
+              for state in (state_a, state_b)]
+    parents = [{hashes[0]: None}, {hashes[1]: None}]
+    frontiers = [[(hashes[0], state_a)], [(hashes[1], state_b)]]
+    sides = (0, 1) if m == 1 else (0,)
+    op_funcs = local_op_map(local_ops)
+
+    def steps_to(side, graph_hash):
+        steps = []
+        while parents[side][graph_hash] is not None:
+            graph_hash, op_label, node = parents[side][graph_hash]
+            steps.append((op_label, node))
+        return steps[::-1]
+
+    def replay(state, steps):
+        for op_label, node in steps:
+            state = op_funcs[op_label](state, node)
+        return state
+    if hashes[0] == hashes[1]:
+        return []
+    # Expands a whole level of the smaller search until the searches meet
+    while all(frontiers[side] for side in sides):
+        side = min(sides, key=lambda s: len(frontiers[s]))
+        visited, other = parents[side], parents[1 - side]
+        next_frontier, meetings = [], []
+        for graph_hash, graph in frontiers[side]:
+            for equiv_nodes, op_label, new_graph, new_cert, _ \
+                    in expand_member(graph, local_ops):
+                new_hash = certificate_digest(new_cert)
+                if new_hash in visited:
+                    continue
+                # The representative node is the first of its equivalents
+                visited[new_hash] = (graph_hash, op_label, equiv_nodes[0])
+                next_frontier.append((new_hash, new_graph))
+                if new_hash in other:
+                    meetings.append((len(steps_to(1 - side, new_hash)),
+                                     new_hash, new_graph))
+        frontiers[side] = next_frontier
+        if not meetings:
+            continue
+        # Joins the searches at the meeting closest to the other graph
+        _, meet_hash, meet_graph = min(meetings, key=lambda x: x[0])
+        steps_a, steps_b = steps_to(0, meet_hash), steps_to(1, meet_hash)
+        path = [(op_label, nodes[i]) for op_label, i in steps_a]
+        if steps_b:
+            meet_a = meet_graph if side == 0 else replay(state_a, steps_a)
+            meet_b = meet_graph if side == 1 else replay(state_b, steps_b)
+            iso = {v: u for u, v in find_isomorphism(meet_a, meet_b).items()}
+            path += [(invert_op_label(op_label, p), nodes[iso[i]])
+                     for op_label, i in steps_b[::-1]]
+        return path
+    return None
+
+
+def count_edges(graph):
+    """ Returns the number of edges of a search graph """
+    if isinstance(graph, tuple):
+        return sum(bin(row).count('1') for row in graph) // 2
+    return graph.number_of_edges()
+
+
+def find_min_edge_reps(init_graph, max_expansions=None, stop_at_bound=False):
+    """
+    Searches the LC orbit of init_graph best-first, always expanding the
+    member with fewest edges, for up to max_expansions members. Returns the
+    minimum edge representatives found, keyed by discovery order and
+    holding their 'edges' and 'hash', and whether they are proven optimal.
+    They are if the orbit is exhausted (and then are all the orbit's MERs)
+    or if, for prime-dimensional graphs, which remain connected, they have
+    n - 1 edges, in which case stop_at_bound ends the search early.
+    """
+    init_graph, nodes, _, local_ops, init_state = \
+        init_orbit_search(init_graph)
+    lower_bound = len(nodes) - 1 \
+        if graph_attr(init_graph, 'power', 1) == 1 else 0
+    init_hash = certificate_digest(graph_certificate(init_state))
+    hashes = {init_hash}
+    min_edges = count_edges(init_state)
+    min_edge_reps = {0: {'edges': member_edges(init_state, nodes),
+                         'hash': init_hash}}
+    # Keeps unexpanded members in a heap ordered by edges then label
+    queue = [(min_edges, 0, init_state)]
+    expansions = 0
+    while queue and (max_expansions is None or expansions < max_expansions):
+        if stop_at_bound and min_edges == lower_bound:
+            break
+        _, _, graph = heapq.heappop(queue)
+        expansions += 1
+        for _, _, new_graph, new_cert, _ in expand_member(graph, local_ops):
+            new_hash = certificate_digest(new_cert)
+            if new_hash in hashes:
+                continue
+            new_label = len(hashes)
+            hashes.add(new_hash)
+            n_edges = count_edges(new_graph)
+            heapq.heappush(queue, (n_edges, new_label, new_graph))
+            # Updates representatives if new member has as few edges
+            if n_edges < min_edges:
+                min_edges, min_edge_reps = n_edges, {}
+            if n_edges == min_edges:
+                min_edge_reps[new_label] = \
+                    {'edges': member_edges(new_graph, nodes),
+                     'hash': new_hash}
+    optimal = not queue or min_edges == lower_bound
+    return min_edge_reps, optimal
+
+
 def get_min_edge_reps(class_graph):
     """ Returns all minimum edge representations for a given LC orbit """
     min_edges = min(len(graph['edges']) for graph in class_graph.nodes.values())
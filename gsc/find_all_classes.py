@@ -5,7 +5,6 @@ import sys
 import numpy as np
 import networkx as nx
 import itertools as it
-from tqdm import tqdm
 from pprint import pprint
 # Local modules
 from gsc.get_nauty import hash_graph
@@ -181,7 +180,8 @@ def find_all_classes(directory, power, prime):
     isomorph_configs = make_isomorph_func(edge_index, n)
     pprint(c_map)
     pprint(edge_index)
-    # Initialises progress bar
+    # Initialises progress bar, importing tqdm on first use
+    from tqdm import tqdm
     rg_file = directory + '/remaining_graphs.csv'
     rem_graphs_size = os.path.getsize(rg_file)
     pbar = tqdm(total=rem_graphs_size)
@@ -1,10 +1,14 @@
 # Python packages
 from math import log
+from hashlib import blake2b
 import networkx as nx
 import pynauty as pyn
+from functools import lru_cache
 from collections import defaultdict
 # Local modules
 from gsc.utils import int_to_bits, copy_graph
+from gsc.bit_graphs import bit_neighbors, bit_degree
+from gsc.qudit_graphs import QuditGraph, graph_attr
 
 
 def qudit_graph_map(nx_wg, partition=None):
@@ -85,22 +89,218 @@ def convert_nx_to_pyn(nx_g, partition=None):
     return pyn_g, from_int_node_map
 
 
-def hash_graph(graph):
-    """ Returns a hash for the graph based on PyNauty's certificate fn """
-    if graph.__dict__.get('power', 1) > 1:
-        pyn_g_mem, _ = convert_nx_to_pyn(graph, partition='member')
-        pyn_g_fam, _ = convert_nx_to_pyn(graph, partition='family')
-        g_mem_hash = hash(pyn.certificate(pyn_g_mem))
-        g_fam_hash = hash(pyn.certificate(pyn_g_fam))
-        g_hash = hash((g_mem_hash, g_fam_hash))
+def convert_bit_to_pyn(bit_g):
+    """ Takes a bit graph and outputs a PyNauty graph """
+    graph_adj = {node: bit_neighbors(bit_g, node)
+                 for node in range(len(bit_g))}
+    return pyn.Graph(len(bit_g), directed=False, adjacency_dict=graph_adj)
+
+
+@lru_cache(maxsize=256)
+def layer_skeleton(nodes, n_layers, power=1, families=None, partition=None):
+    """
+    Returns the vertex numbering, vertical (and family) adjacency lists and
+    colouring of the layered coloured graph of qudit_graph_map, which only
+    depend on the graph's nodes, number of layers and partition.
+    Node i of layer number layer is vertex layer * n_v + i, where n_v counts
+    the graph's nodes and, for 'family' and 'both' partitions, the extra
+    family nodes.
+    """
+    nodes = list(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    layers = range(n_layers)
+    f_edges = []
+    if power > 1:
+        m, f = power, families
+        # Adds extra nodes to represent exchangeable family colours
+        # (see page 60 of nauty user guide v26)
+        if partition in ('family', 'both'):
+            for u in range(f):
+                if (u, m) not in index:
+                    index[(u, m)] = len(nodes)
+                    nodes.append((u, m))
+            f_edges = [(index[(u, m)], index[(u, i)])
+                       for u in range(f) for i in range(m)]
+        elif partition != 'member':
+            raise Exception("Unknown colour scheme provided")
+    n_v = len(nodes)
+    # Adds vertical edges between layers and family edges in the first layer
+    skeleton = [[(layer + 1) * n_v + i] if layer + 1 < n_layers else []
+                for layer in layers for i in range(n_v)]
+    for i, j in f_edges:
+        skeleton[i].append(j)
+    # Colours vertices by layer (and member and/or family for prime-power)
+    if power == 1:
+        coloring = [set(range(layer * n_v, (layer + 1) * n_v))
+                    for layer in layers]
+    elif partition == 'family':
+        coloring = [set(layer * n_v + index[(n, i)]
+                        for n in range(f) for i in range(m))
+                    for layer in layers]
     else:
-        pyn_g, _ = convert_nx_to_pyn(graph)
-        g_hash = hash(pyn.certificate(pyn_g))
-    return g_hash
+        coloring = [set(layer * n_v + index[(n, i)] for n in range(f))
+                    for layer in layers for i in range(m)]
+    if power > 1 and partition != 'member':
+        coloring += [set(layer * n_v + index[(n, m)] for n in range(f))
+                     for layer in layers]
+    return index, n_v, skeleton, coloring
+
+
+def convert_weighted_to_pyn(nx_wg, partition=None):
+    """
+    Builds the PyNauty graph of the layered coloured graph of qudit_graph_map
+    directly from an edge-weighted NetworkX graph or QuditGraph, with
+    identical vertex numbering and colouring but no intermediate graph.
+    Prime-power graphs may also be coloured by both member and family, so
+    that their automorphisms preserve both at once.
+    The graph's layer skeleton is cached, leaving only its weight-bit edges
+    to be added.
+    """
+    if isinstance(nx_wg, QuditGraph):
+        nodes, w_edges = nx_wg.nodes, nx_wg.index_edges()
+    else:
+        nodes, w_edges = tuple(nx_wg.nodes()), nx_wg.edges(data='weight')
+    power = graph_attr(nx_wg, 'power', 1)
+    families = graph_attr(nx_wg, 'families') if power > 1 else None
+    if power == 1:
+        partition = None
+    n_layers = max((w for _, _, w in w_edges), default=1).bit_length()
+    index, n_v, skeleton, coloring = \
+        layer_skeleton(nodes, n_layers, power, families, partition)
+    # Adds weight-bit edges within layers to a copy of the skeleton
+    graph_adj = {v: list(neighs) for v, neighs in enumerate(skeleton)}
+    if not isinstance(nx_wg, QuditGraph):
+        w_edges = [(index[u], index[v], w) for u, v, w in w_edges]
+    for i, j, w in w_edges:
+        for layer in range(n_layers):
+            if w >> layer & 1:
+                graph_adj[layer * n_v + i].append(layer * n_v + j)
+    pyn_g = pyn.Graph(n_v * n_layers, directed=False,
+                      adjacency_dict=graph_adj, vertex_coloring=coloring)
+    return pyn_g
+
+
+def nauty_graph(graph, partition=None):
+    """
+    Returns a PyNauty graph for a bit graph, QuditGraph or NetworkX graph,
+    built directly from its adjacency, along with the list of graph nodes
+    (node indices for bit graphs and QuditGraphs) that label its first
+    len(nodes) vertices (i.e. its first layer for qudit graphs).
+    Prime-power graphs are coloured by both member and family unless
+    partition is 'member' or 'family'.
+    """
+    if isinstance(graph, tuple):
+        return convert_bit_to_pyn(graph), list(range(len(graph)))
+    qudit = isinstance(graph, QuditGraph)
+    if graph_attr(graph, 'dimension', 2) > 2:
+        if graph_attr(graph, 'power', 1) > 1 and partition is None:
+            partition = 'both'
+        pyn_g = convert_weighted_to_pyn(graph, partition)
+        nodes = list(range(len(graph.nodes))) if qudit else list(graph.nodes())
+        return pyn_g, nodes
+    if qudit:
+        n = len(graph.nodes)
+        graph_adj = {u: graph.neighbors(u) for u in range(n)}
+        return pyn.Graph(n, directed=False, adjacency_dict=graph_adj), \
+            list(range(n))
+    nodes = list(graph.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    graph_adj = {index[u]: [index[v] for v in neighs]
+                 for u, neighs in graph.adjacency()}
+    pyn_g = pyn.Graph(len(nodes), directed=False, adjacency_dict=graph_adj)
+    return pyn_g, nodes
+
+
+def graph_certificate(graph, nauty_g=None):
+    """
+    Returns PyNauty's certificate for the graph. Prime-power graphs are
+    coloured by both member and family, so one certificate captures both.
+    nauty_g optionally gives the graph's nauty_graph to avoid rebuilding it.
+    """
+    pyn_g, _ = nauty_graph(graph) if nauty_g is None else nauty_g
+    return pyn.certificate(pyn_g)
+
+
+def find_rep_nodes(graph, nauty_g=None):
+    """
+    Takes a bit graph, QuditGraph or NetworkX graph and finds groups of nodes
+    (node indices for bit graphs and QuditGraphs) that are equivalent up to
+    automorphism, ignoring nodes on which qubit LC acts trivially.
+    nauty_g optionally gives the graph's nauty_graph.
+    """
+    # Creates PyNauty graph and passes it to PyNauty to get orbits
+    pyn_g, nodes = nauty_graph(graph) if nauty_g is None else nauty_g
+    _, _, _, orbits, _ = pyn.autgrp(pyn_g)
+    # Finds node equivalency dictionary from orbits of nodes in first layer
+    node_equivs = defaultdict(list)
+    for node, equiv in zip(nodes, orbits):
+        node_equivs[nodes[equiv]].append(node)
+    # Removes any LC's that act trivially on qubit graphs (i.e. d=1 nodes)
+    if isinstance(graph, tuple):
+        node_equivs = {node: equivs for node, equivs in node_equivs.items()
+                       if bit_degree(graph, node) > 1}
+    elif graph_attr(graph, 'dimension', 2) == 2:
+        node_equivs = {node: equivs for node, equivs in node_equivs.items()
+                       if graph.degree(node) > 1}
+    return dict(node_equivs)
+
+
+def analyse_graph(graph):
+    """
+    Returns the certificate and representative nodes of a graph, building
+    its PyNauty graph only once
+    """
+    nauty_g = nauty_graph(graph)
+    return graph_certificate(graph, nauty_g), find_rep_nodes(graph, nauty_g)
+
+
+def find_isomorphism(graph1, graph2):
+    """
+    Returns an isomorphism from graph1 to graph2 (of the same kind) as a
+    dict of nodes (node indices for bit graphs and QuditGraphs), or None if
+    they are not isomorphic. Prime-power graphs are coloured by both member
+    and family (the 'both' partition of nauty_graph), so the isomorphism
+    preserves both.
+    """
+    pyn_g1, nodes1 = nauty_graph(graph1)
+    pyn_g2, nodes2 = nauty_graph(graph2)
+    if pyn.certificate(pyn_g1) != pyn.certificate(pyn_g2):
+        return None
+    # Matches vertices with the same canonical label in the first layer
+    n = len(nodes1)
+    return {nodes1[v1]: nodes2[v2] for v1, v2
+            in zip(pyn.canon_label(pyn_g1), pyn.canon_label(pyn_g2))
+            if v1 < n}
+
+
+class CertificateCollisionError(Exception):
+    """ Raised when distinct certificates have the same digest """
+
+
+def certificate_key(cert):
+    """ Returns a certificate returned by graph_certificate as bytes """
+    return bytes(cert)
+
+
+def certificate_digest(cert):
+    """
+    Returns a stable 128-bit digest (as an int) of a certificate returned by
+    graph_certificate. Unlike Python's hash, this is the same in every
+    process and on every system.
+    """
+    digest = blake2b(certificate_key(cert), digest_size=16).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def hash_graph(graph):
+    """ Returns a stable digest of the graph's PyNauty certificate """
+    return certificate_digest(graph_certificate(graph))
 
 
 def canonical_relabel(nx_g):
     """ Returns isomorphic graph with canonical relabelling """
+    if isinstance(nx_g, QuditGraph):
+        nx_g = nx_g.to_nx()
     nodes, neighs = zip(*nx_g.adjacency())
     pyn_g, node_map = convert_nx_to_pyn(nx_g)
     canon_lab = pyn.canon_label(pyn_g)
@@ -108,26 +308,3 @@ def canonical_relabel(nx_g):
                    in zip(nodes, canon_lab)}
     nx_g_canon = nx.relabel_nodes(nx_g, canon_relab)
     return nx_g_canon
-
-
-def find_rep_nodes(nx_g):
-    """
-    Takes a NetworkX graph and finds groups of nodes that are equivalent
-    up to automorphism
-    """
-    # Creates PyNauty graph and passes it to PyNauty to get orbits
-    partition = 'member' if nx_g.__dict__.get('power', 1) > 1 else None
-    pyn_g, node_map = convert_nx_to_pyn(nx_g, partition=partition)
-    _, _, _, orbits, _ = pyn.autgrp(pyn_g)
-    # Finds node equivalency dictionary
-    node_equivs = defaultdict(list)
-    for node, equiv in enumerate(orbits):
-        node_equivs[node_map[equiv]].append(node_map[node])
-    # Removes any LC's that act trivially on the graph (i.e. act on d=1 nodes)
-    node_equivs = {node: equivs for node, equivs in node_equivs.items()
-                   if nx_g.degree(node) > 1}
-    # If multigraph, returns orbits of nodes in first layer
-    if nx_g.__dict__.get('dimension', 2) > 2:
-        node_equivs = {u: [v for l_v, v in equivs if l_v == 0]
-                       for (l_u, u), equivs in node_equivs.items() if l_u == 0}
-    return node_equivs
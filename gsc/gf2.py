@@ -0,0 +1,89 @@
+# Python packages
+import numpy as np
+
+
+def pack_rows(A):
+    """
+    Packs the rows of a 0/1 matrix into uint64 words, with column j as bit
+    63 - j % 64 of word j // 64
+    """
+    A = np.asarray(A, dtype=np.uint8) & 1
+    n, m = A.shape
+    n_words = -(-m // 64)
+    bytes_ = np.packbits(A, axis=1)
+    padded = np.zeros((n, 8 * n_words), dtype=np.uint8)
+    padded[:, :bytes_.shape[1]] = bytes_
+    return padded.view('>u8').astype(np.uint64)
+
+
+def unpack_rows(words, m):
+    """ Unpacks rows of uint64 words into an int matrix with m columns """
+    bytes_ = words.astype('>u8').view(np.uint8)
+    return np.unpackbits(bytes_, axis=1)[:, :m].astype(int)
+
+
+def eliminate(words, m):
+    """
+    Takes packed rows to reduced row echelon form in place, returning the
+    pivot columns
+    """
+    n = words.shape[0]
+    pivots = []
+    for j in range(m):
+        if len(pivots) == n:
+            break
+        i = len(pivots)
+        w, mask = j // 64, np.uint64(1 << (63 - j % 64))
+        # Finds a row with a one in column j to pivot on
+        ones = np.flatnonzero(words[i:, w] & mask)
+        if not len(ones):
+            continue
+        p = i + ones[0]
+        if p != i:
+            words[[i, p]] = words[[p, i]]
+        # Clears column j in all other rows (earlier words of row i are 0)
+        rows = np.flatnonzero(words[:, w] & mask)
+        rows = rows[rows != i]
+        words[rows, w:] ^= words[i, w:]
+        pivots.append(j)
+    return pivots
+
+
+def rref(A):
+    """ Returns the reduced row echelon form of A over GF(2) and its pivots """
+    m = np.shape(A)[1]
+    words = pack_rows(A)
+    pivots = eliminate(words, m)
+    return unpack_rows(words, m), pivots
+
+
+def rank(A):
+    """ Returns the rank of A over GF(2) """
+    return len(eliminate(pack_rows(A), np.shape(A)[1]))
+
+
+def nullspace(A):
+    """
+    Returns a basis of the nullspace of A over GF(2) as the rows of a matrix,
+    with one row for each free column of RREF(A) (in order) that is one in
+    that column and zero in the others
+    """
+    R, pivots = rref(A)
+    m = R.shape[1]
+    pivot_set = set(pivots)
+    free = [j for j in range(m) if j not in pivot_set]
+    N = np.zeros((len(free), m), dtype=int)
+    N[np.arange(len(free)), free] = 1
+    N[:, pivots] = R[:len(pivots), free].T
+    return N
+
+
+def solve(A, b):
+    """ Returns a solution x of A x = b over GF(2), or None if there is none """
+    m = np.shape(A)[1]
+    R, pivots = rref(np.column_stack([A, b]))
+    if pivots and pivots[-1] == m:
+        return None
+    x = np.zeros(m, dtype=int)
+    x[pivots] = R[:len(pivots), m]
+    return x
@@ -1,10 +1,11 @@
 # Python packages
 import csv
-import sympy as sp
 import numpy as np
 import itertools as it
 # Local modules
-from gsc.utils import canonical_edge_order, flatten, powerset
+from gsc import gf2
+from gsc.utils import powerset
+from gsc.qudit_graphs import QuditGraph
 
 bin2gate = {(1, 0, 0, 1): 'I', (0, 1, 1, 0): 'H', (1, 0, 1, 1): 'S',
             (1, 1, 1, 0): 'HS', (0, 1, 1, 1): 'SH', (1, 1, 0, 1): 'HSH'}
@@ -12,12 +13,19 @@ bin2gate = {(1, 0, 0, 1): 'I', (0, 1, 1, 0): 'H', (1, 0, 1, 1): 'S',
 
 def get_adjacency_matrix(graph):
     """ Returns the adjacency matrix with a canonical node basis """
-    # Canonically orders the nodes and edges
+    if isinstance(graph, QuditGraph):
+        key = sorted(graph.nodes)
+        order = [graph.index[node] for node in key]
+        adj_mat = (graph.weights[np.ix_(order, order)] != 0).astype(int)
+        return adj_mat, key
+    # Canonically orders the nodes and sets each edge's entries
     key = sorted(graph.nodes())
-    edges = canonical_edge_order(graph.edges())
-    # Creates the adjacency matrix and exports to CSV
-    adj_mat = np.array([[int(tuple(sorted((u, v))) in edges) for u in key]
-                        for v in key])
+    index = {node: i for i, node in enumerate(key)}
+    adj_mat = np.zeros((len(key), len(key)), dtype=int)
+    if graph.number_of_edges():
+        rows, cols = np.array([(index[u], index[v])
+                               for u, v in graph.edges()]).T
+        adj_mat[rows, cols] = adj_mat[cols, rows] = 1
     return adj_mat, key
 
 
@@ -33,59 +41,43 @@ def export_adjacency_matrix(graph, filename):
 
 
 def to_rref(A):
+    """ Takes n x m matrix A to its reduced row echelon form over GF(2) """
+    return gf2.rref(A)[0]
+
+
+def GF2nullspace(A):
     """
-        Takes n x m matrix A to it's reduced row echelon form.
-        Algorithm from: https://www.di-mgt.com.au/matrixtransform.html
+    Finds a basis of the nullspace of A over GF(2) (see gf2.nullspace),
+    listing the vectors of free columns after the last pivot first
     """
-    n, m = A.shape
-    j = 0
-    for i in range(n):
-        # While column j has all zero elements, set j = j+1. If j>m return A.
-        while all(A[i:, j] == 0):
-            j += 1
-            if j >= m:
-                return A
-        # If element a_ij = 0, then swap row i with row x>i where a_xj != 0.
-        if A[i, j] == 0:
-            for x in range(i+1, n):
-                if A[x, j] != 0:
-                    A[[x, i]] = A[[i, x]]
-                    break
-        # Divide each element of row i by a_ij, thus making the pivot a_ij = 1.
-        A[i] //= A[i, j]
-        # For each row k from 1 to n, with k != i,
-        # subtract row i multiplied by a_kj from row k.
-        for k in [k for k in range(n) if k != i]:
-            A[k] = (A[k] - A[i] * A[k, j]) % 2
-    return A
+    N = gf2.nullspace(A)
+    m = N.shape[1]
+    # Each vector's free column is its last non-zero entry
+    free = m - 1 - np.argmax(N[:, ::-1], axis=1)
+    pivots = sorted(set(range(m)) - set(free.tolist()))
+    last_pivot = pivots[-1] if pivots else -1
+    return N[np.argsort(free < last_pivot, kind='stable')]
 
 
-def GF2nullspace(A):
+def lc_equiv_system(am1, am2):
     """
-        Finds nullspace of A using RREF(A).
-        Follows decription here:
-        https://math.stackexchange.com/questions/130207/
-        finding-null-space-basis-over-a-finite-field
+    Returns the GF(2) linear system whose solutions Q = [[A, B], [C, D]]
+    (with A, B, C, D diagonal) satisfy S1^T Q^T P S2 = 0, where S = [G; I]
+    for adjacency matrix G and P swaps the blocks (following Bouchet).
+    Entry (j, k) of S1^T Q^T P S2 = G1 A + G1 C G2 + B + D G2 is the row
+    j * n + k, and the unknowns are ordered a_0, b_0, c_0, d_0, a_1, ...
     """
-    # Takes A to reduced row echelon form and removes any all-zero rows
-    A = to_rref(A)
-    A = A[~(A == 0).all(1)]
-    # Permutes columns of A into [ I_n | P ] form (I_n is n x n, P is n x k)
-    n, m = A.shape
-    perms = []
-    Id = np.eye(n, dtype=int)
-    for i in range(n):
-        while A[:, i].tolist() != Id[:, i].tolist():
-            perm = list(range(i, m))
-            A[:, perm] = A[:, list(range(i + 1, m)) + [i]]
-            perms.append(perm)
-    P = A[:, n:]
-    # N(A) is spanned by [P^T | I_k ] (P^T is k x n and I_k is k x k)
-    N = np.hstack([P.T, np.eye(P.shape[1], dtype=int)])
-    # Undo column permutations to retrieve N(A) in original basis
-    for perm in perms[::-1]:
-        N[:, perm] = N[:, [perm[-1]] + perm[:-1]]
-    return N
+    n = len(am1)
+    idx = np.arange(n)
+    X = np.zeros((n, n, n, 4), dtype=np.uint8)
+    # (G1 A)_jk = G1_jk a_k and B_jk = b_j if j == k
+    X[:, idx, idx, 0] = am1
+    X[idx, idx, idx, 1] = 1
+    # (G1 C G2)_jk = sum_i G1_ji c_i G2_ik
+    X[:, :, :, 2] = np.einsum('ji,ik->jki', am1, am2)
+    # (D G2)_jk = d_j G2_jk
+    X[idx[:, None], idx, idx[:, None], 3] = am2
+    return X.reshape(n * n, 4 * n)
 
 
 def are_lc_equiv(g1, g2):
@@ -99,29 +91,11 @@ def are_lc_equiv(g1, g2):
     dim1, dim2 = len(k1), len(k2)
     if k1 != k2 or am1.shape != (dim1, dim1) or am2.shape != (dim2, dim2):
         return False, None
-    # Defines binary matrices
-    Id = sp.eye(dim1)
-    S1 = sp.Matrix(am1).col_join(Id)
-    S2 = sp.Matrix(am2).col_join(Id)
-    # Defines symbolic variables
-    A = sp.symbols('a:' + str(dim1), bool=True)
-    B = sp.symbols('b:' + str(dim1), bool=True)
-    C = sp.symbols('c:' + str(dim1), bool=True)
-    D = sp.symbols('d:' + str(dim1), bool=True)
-    # Defines solution matrix basis
-    abcd = flatten(zip(A, B, C, D))
-    no_vars = len(abcd)
-    no_qubits = no_vars // 4
-    # Creates symbolic binary matrix
-    A, B, C, D = sp.diag(*A), sp.diag(*B), sp.diag(*C), sp.diag(*D)
-    Q = A.row_join(B).col_join(C.row_join(D))
-    P = sp.zeros(dim1).row_join(Id).col_join(Id.row_join(sp.zeros(dim1)))
     # Constructs matrix to solve
-    X = [i for i in S1.T * Q.T * P * S2]
-    X = np.array([[x.coeff(v) for v in abcd] for x in X], dtype=int)
-    # Removes any duplicated and all-zero rows
-    X = np.unique(X, axis=0)
-    X = X[~(X == 0).all(1)]
+    X = lc_equiv_system(am1, am2)
+    no_qubits = dim1
+    # Removes any all-zero rows (duplicates are eliminated by XOR)
+    X = X[X.any(1)]
     # Finds the solutions (the nullspace of X)
     V = list(GF2nullspace(X))
     if len(V) > 4:
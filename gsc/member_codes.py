@@ -0,0 +1,177 @@
+# Python packages
+import numpy as np
+import networkx as nx
+import itertools as it
+# Local modules
+from gsc.utils import copy_graph_attrs
+from gsc.qudit_graphs import QuditGraph
+from gsc.bit_graphs import bit_neighbors, bit_graph_edges, from_bit_graph
+
+
+def pack_bit_graph(bit_g):
+    """ Packs the upper triangle of a bit graph's adjacency into an int """
+    n = len(bit_g)
+    code, offset = 0, 0
+    for i, row in enumerate(bit_g):
+        code |= (row >> (i + 1)) << offset
+        offset += n - i - 1
+    return code
+
+
+def unpack_bit_graph(code, n):
+    """ Unpacks a bit graph from its packed upper triangle """
+    rows = [0] * n
+    offset = 0
+    for i in range(n):
+        upper = (code >> offset) & ((1 << (n - i - 1)) - 1)
+        rows[i] |= upper << (i + 1)
+        offset += n - i - 1
+    # Adds lower triangle from upper triangle
+    for i in range(n):
+        for j in bit_neighbors(rows, i):
+            if j > i:
+                rows[j] |= 1 << i
+    return tuple(rows)
+
+
+def pack_weights(graph, nodes):
+    """
+    Packs the upper triangle of a weighted graph's adjacency matrix (with
+    nodes ordered by nodes) into bytes, one weight per byte
+    """
+    index = {node: i for i, node in enumerate(nodes)}
+    n = len(nodes)
+    code = bytearray(n * (n - 1) // 2)
+    for u, v, w in graph.edges(data='weight'):
+        i, j = sorted((index[u], index[v]))
+        code[i * (2 * n - i - 1) // 2 + j - i - 1] = w
+    return bytes(code)
+
+
+def unpack_weights(code, nodes):
+    """ Unpacks the weighted edges from a packed upper triangle """
+    pairs = it.combinations(nodes, 2)
+    return [(u, v, w) for (u, v), w in zip(pairs, code) if w]
+
+
+def pack_qudit_graph(graph):
+    """ Packs the upper triangle of a QuditGraph's weights into bytes """
+    n = len(graph.nodes)
+    return graph.weights[np.triu_indices(n, 1)].tobytes()
+
+
+def unpack_qudit_graph(code, init_state):
+    """ Unpacks a QuditGraph like init_state from its packed upper triangle """
+    n = len(init_state.nodes)
+    us, vs = np.triu_indices(n, 1)
+    weights = np.zeros((n, n), dtype=np.uint8)
+    weights[us, vs] = weights[vs, us] = np.frombuffer(code, dtype=np.uint8)
+    return init_state.copy(weights)
+
+
+class MemberCodec(object):
+    """
+    Converts class members to and from compact codes. Qubit members are
+    bit graphs packed into ints and qudit members are QuditGraphs (or
+    NetworkX graphs) packed into weight bytes.
+    """
+    __slots__ = ('init_graph', 'init_state', 'nodes', 'bits')
+
+    def __init__(self, init_graph, bits):
+        self.init_graph = init_graph
+        self.init_state = None if bits else QuditGraph.from_nx(init_graph)
+        self.nodes = list(init_graph.nodes())
+        self.bits = bits
+
+    def encode(self, graph):
+        """ Returns the code for a search graph """
+        if self.bits:
+            return pack_bit_graph(graph)
+        if isinstance(graph, QuditGraph):
+            return pack_qudit_graph(graph)
+        return pack_weights(graph, self.nodes)
+
+    def decode(self, code):
+        """ Returns the search graph (bit graph or QuditGraph) for a code """
+        if self.bits:
+            return unpack_bit_graph(code, len(self.nodes))
+        return unpack_qudit_graph(code, self.init_state)
+
+    def to_nx(self, code):
+        """ Returns the NetworkX graph for a code """
+        if self.bits:
+            graph = from_bit_graph(self.decode(code), self.nodes)
+        else:
+            graph = nx.Graph()
+            graph.add_nodes_from(self.nodes)
+            graph.add_weighted_edges_from(unpack_weights(code, self.nodes))
+        return copy_graph_attrs(self.init_graph, graph)
+
+    def edges(self, code):
+        """ Returns the weighted edge list for a code """
+        if self.bits:
+            nodes = self.nodes
+            return [(nodes[u], nodes[v], 1)
+                    for u, v in bit_graph_edges(self.decode(code))]
+        return unpack_weights(code, self.nodes)
+
+
+class MemberData(dict):
+    """
+    Class graph node attribute dict for compactly stored members. Only the
+    member's code is stored (as an attribute, not an item) and the 'nx_graph'
+    and 'edges' items are rebuilt from it whenever accessed.
+    """
+    __slots__ = ('codec', 'code', 'lazy_keys')
+
+    def __init__(self, codec, code=None):
+        super(MemberData, self).__init__()
+        self.codec = codec
+        self.code = code
+        self.lazy_keys = ('nx_graph', 'edges')
+
+    def __missing__(self, key):
+        if key not in self.lazy_keys:
+            raise KeyError(key)
+        if key == 'nx_graph':
+            return self.codec.to_nx(self.code)
+        return self.codec.edges(self.code)
+
+    def __setitem__(self, key, value):
+        self.lazy_keys = tuple(k for k in self.lazy_keys if k != key)
+        dict.__setitem__(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.lazy_keys or dict.__contains__(self, key)
+
+    def __iter__(self):
+        return it.chain(dict.__iter__(self), self.lazy_keys)
+
+    def __len__(self):
+        return dict.__len__(self) + len(self.lazy_keys)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def pop(self, key, *default):
+        if key in self.lazy_keys:
+            value = self[key]
+            self.lazy_keys = tuple(k for k in self.lazy_keys if k != key)
+            return value
+        return dict.pop(self, key, *default)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def copy(self):
+        return dict(self.items())
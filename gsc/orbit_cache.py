@@ -0,0 +1,189 @@
+# Python packages
+import os
+import time
+import zlib
+import pickle
+import sqlite3
+import networkx as nx
+# Local modules
+from gsc.utils import copy_graph_attrs
+from gsc.get_nauty import hash_graph, find_isomorphism
+from gsc.qudit_graphs import graph_attr
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orbits (
+    orbit INTEGER PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lru ON orbits (last_used);
+CREATE TABLE IF NOT EXISTS members (
+    prime INTEGER NOT NULL,
+    power INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    orbit INTEGER NOT NULL,
+    label INTEGER NOT NULL,
+    PRIMARY KEY (prime, power, digest)
+);
+CREATE INDEX IF NOT EXISTS member_orbits ON members (orbit);
+"""
+
+
+class OrbitCache(object):
+    """
+    SQLite-backed cache of explored orbits kept across runs at path. Maps the
+    certificate digest (and dimension) of every member to its orbit and
+    member label, and holds each orbit's members and links. Orbits are
+    evicted least recently used first once their total size exceeds
+    max_bytes. Any number of processes may read and add orbits at once.
+    """
+    __slots__ = ('path', 'max_bytes', 'conn')
+
+    def __init__(self, path, max_bytes=2 ** 30):
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM orbits").fetchone()[0]
+
+    def size(self):
+        """ Returns the total size in bytes of the stored orbits """
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM orbits")\
+            .fetchone()[0]
+
+    def find(self, graph, key=None):
+        """
+        Returns the orbit and member label of graph or None if unknown.
+        key optionally gives graph's member_key.
+        """
+        key = member_key(graph) if key is None else key
+        row = self.conn.execute("SELECT orbit, label FROM members "
+                                "WHERE prime = ? AND power = ? "
+                                "AND digest = ?", key).fetchone()
+        return None if row is None else tuple(row)
+
+    def get(self, graph, save_edges=True):
+        """
+        Returns the cached class graph of graph's orbit (as returned by
+        explore_lc_orbit), relabelled to graph's nodes with graph as member 0,
+        or None if graph's orbit is not cached
+        """
+        found = self.find(graph)
+        if found is None:
+            return None
+        orbit, label = found
+        with self.conn:
+            row = self.conn.execute("SELECT data FROM orbits WHERE orbit = ?",
+                                    (orbit,)).fetchone()
+            # Orbit was evicted since it was found
+            if row is None:
+                return None
+            self.conn.execute("UPDATE orbits SET last_used = ? "
+                              "WHERE orbit = ?", (time.time(), orbit))
+        data = pickle.loads(zlib.decompress(row[0]))
+        return cached_class_graph(data, graph, label, save_edges)
+
+    def add(self, class_graph, init_graph):
+        """
+        Adds the class graph returned by explore_lc_orbit for init_graph,
+        unless its orbit is already cached or it alone exceeds max_bytes.
+        Returns whether the orbit was added.
+        """
+        data = zlib.compress(pickle.dumps(orbit_data(class_graph, init_graph),
+                                          protocol=2))
+        if len(data) > self.max_bytes:
+            return False
+        key = member_key(init_graph)
+        p, m = key[:2]
+        with self.conn:
+            # Another process may have cached the orbit meanwhile
+            self.conn.execute('BEGIN IMMEDIATE')
+            if self.find(init_graph, key) is not None:
+                return False
+            orbit = self.conn.execute("INSERT INTO orbits (data, size, "
+                                      "last_used) VALUES (?, ?, ?)",
+                                      (data, len(data), time.time()))\
+                .lastrowid
+            self.conn.executemany("INSERT OR IGNORE INTO members "
+                                  "VALUES (?, ?, ?, ?, ?)",
+                                  ((p, m, graph_hash.to_bytes(16, 'big'),
+                                    orbit, label) for label, graph_hash
+                                   in class_graph.nodes(data='hash')))
+            self.evict()
+        return True
+
+    def evict(self):
+        """ Removes least recently used orbits until within max_bytes """
+        total = self.size()
+        cursor = self.conn.execute("SELECT orbit, size FROM orbits "
+                                   "ORDER BY last_used").fetchall()
+        for orbit, size in cursor:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM members WHERE orbit = ?", (orbit,))
+            self.conn.execute("DELETE FROM orbits WHERE orbit = ?", (orbit,))
+            total -= size
+
+    def close(self):
+        """ Closes the cache """
+        self.conn.close()
+
+
+def member_key(graph):
+    """ Returns the dimension and certificate digest keying a member """
+    return (graph_attr(graph, 'prime', 2), graph_attr(graph, 'power', 1),
+            hash_graph(graph).to_bytes(16, 'big'))
+
+
+def orbit_data(class_graph, init_graph):
+    """ Returns the cached data of a class graph returned by explore_lc_orbit """
+    return {'nodes': list(init_graph.nodes()),
+            'members': [(data['hash'], data['edges'])
+                        for _, data in class_graph.nodes(data=True)],
+            'links': [(u, v, data['ops'], data['equivs'])
+                      for u, v, data in class_graph.edges(data=True)]}
+
+
+def cached_class_graph(data, graph, label, save_edges=True):
+    """
+    Builds the class graph from cached orbit data, relabelling its nodes to
+    those of graph (the member with label), which becomes member 0
+    """
+    # Maps the cached member's nodes onto graph's
+    member_graph = weighted_graph(data['nodes'], data['members'][label][1],
+                                  graph)
+    relabel = find_isomorphism(member_graph, graph)
+    nodes = [relabel[node] for node in data['nodes']]
+    # Swaps graph's member with member 0
+    swap = {0: label, label: 0}
+    class_graph = nx.Graph()
+    class_graph.member_hash_table = {}
+    for new_label in range(len(data['members'])):
+        graph_hash, edges = data['members'][swap.get(new_label, new_label)]
+        edges = [(relabel[u], relabel[v], w) for u, v, w in edges]
+        class_graph.add_node(new_label, hash=graph_hash,
+                             nx_graph=weighted_graph(nodes, edges, graph),
+                             edges=edges)
+        class_graph.member_hash_table[graph_hash] = new_label
+    if not save_edges:
+        return class_graph
+    for u, v, ops, equivs in data['links']:
+        class_graph.add_edge(swap.get(u, u), swap.get(v, v), ops=list(ops),
+                             equivs=[[relabel[node] for node in equiv_nodes]
+                                     for equiv_nodes in equivs])
+    return class_graph
+
+
+def weighted_graph(nodes, edges, graph):
+    """ Returns the NetworkX graph of weighted edges with graph's attributes """
+    nx_graph = nx.Graph()
+    nx_graph.add_nodes_from(nodes)
+    nx_graph.add_weighted_edges_from(edges)
+    return copy_graph_attrs(graph, nx_graph)
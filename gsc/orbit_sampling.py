@@ -0,0 +1,115 @@
+# Python packages
+import random
+import pynauty as pyn
+from functools import partial
+from collections import Counter
+# Local modules
+from gsc.get_nauty import nauty_graph, graph_certificate, certificate_digest
+from gsc.bit_graphs import bit_qubit_LC
+from gsc.qudit_graphs import qudit_LC, qudit_EM, graph_attr
+from gsc.explore_lc_orbit import (
+    init_orbit_search,
+    count_edges,
+    member_nx_graph,
+)
+
+
+def sample_lc_orbit(init_graph, n_samples=1000, steps=None, seed=None,
+                    z=1.96, blocks=10):
+    """
+    Estimates the size and edge count distribution of the LC orbit of a
+    qubit or prime-dimensional graph from n_samples members found by a lazy
+    random walk, taking steps random local ops between samples (by default
+    twice the number of node and op pairs).
+    Labelled graphs are visited uniformly, so each member is sampled in
+    proportion to 1 / |Aut|. The orbit size is estimated from the number of
+    pairs of samples of the same member (weighting for this bias), with a
+    confidence interval for normal quantile z from the jackknife standard
+    error over the given number of blocks of consecutive samples.
+    Returns a dictionary of the number of 'samples', 'distinct' members and
+    'collisions', the estimated 'size' and its 'size_interval', the
+    estimated fraction of members with each edge count, 'edge_distribution',
+    and the sampled members with fewest edges, 'min_edge_reps'.
+    """
+    if graph_attr(init_graph, 'power', 1) > 1:
+        raise ValueError("Prime-power orbits cannot be sampled")
+    init_graph, nodes, bits, _, graph = init_orbit_search(init_graph)
+    p = graph_attr(init_graph, 'prime', 2)
+    # Uses the single local ops, whose inverses are also local ops
+    if bits:
+        walk_ops = [bit_qubit_LC]
+    else:
+        walk_ops = [partial(qudit_LC, a=a, copy=False) for a in range(1, p)]
+        walk_ops += [partial(qudit_EM, b=b, copy=False) for b in range(2, p)]
+    steps = 2 * len(nodes) * len(walk_ops) if steps is None else steps
+    rng = random.Random(seed)
+    hashes = []
+    weights = []
+    edge_weights = Counter()
+    min_edges, min_edge_reps = None, {}
+    for _ in range(n_samples):
+        # Walks, staying put half the time so that the walk is aperiodic
+        for _ in range(steps):
+            if rng.random() < 0.5:
+                continue
+            op = rng.choice(walk_ops)
+            graph = op(graph, rng.randrange(len(nodes)))
+        # Finds the sampled member's certificate and automorphism group size
+        nauty_g = nauty_graph(graph)
+        graph_hash = certificate_digest(graph_certificate(graph, nauty_g))
+        _, grpsize1, grpsize2, _, _ = pyn.autgrp(nauty_g[0])
+        aut_size = grpsize1 * 10 ** grpsize2
+        hashes.append(graph_hash)
+        weights.append(1.0 / aut_size)
+        # Weights edge counts by |Aut| to undo the sampling bias
+        n_edges = count_edges(graph)
+        edge_weights[n_edges] += aut_size
+        if min_edges is None or n_edges < min_edges:
+            min_edges, min_edge_reps = n_edges, {}
+        if n_edges == min_edges and graph_hash not in min_edge_reps:
+            min_edge_reps[graph_hash] = \
+                member_nx_graph(graph, init_graph, nodes)
+    # Estimates size, leaving out each block of samples in turn for its
+    # jackknife standard error, and bounds it below by the members seen
+    size = estimate_size(hashes, weights)
+    block = -(-n_samples // blocks)
+    block_sizes = [estimate_size(hashes[:i] + hashes[i + block:],
+                                 weights[:i] + weights[i + block:])
+                   for i in range(0, n_samples, block)]
+    mean_size = sum(block_sizes) / len(block_sizes)
+    std_err = ((len(block_sizes) - 1) / len(block_sizes) *
+               sum((block_size - mean_size) ** 2
+                   for block_size in block_sizes)) ** 0.5 \
+        if mean_size < float('inf') else float('inf')
+    distinct = len(set(hashes))
+    total_weight = sum(edge_weights.values())
+    return {'samples': n_samples,
+            'distinct': distinct,
+            'collisions': count_collisions(hashes),
+            'size': max(size, distinct),
+            'size_interval': (max(size - z * std_err, distinct)
+                              if std_err < float('inf') else distinct,
+                              size + z * std_err),
+            'edge_distribution': {n_edges: weight / total_weight
+                                  for n_edges, weight
+                                  in sorted(edge_weights.items())},
+            'min_edge_reps': list(min_edge_reps.values())}
+
+
+def count_collisions(hashes):
+    """ Returns the number of pairs of samples of the same member """
+    return sum(count * (count - 1) // 2 for count in Counter(hashes).values())
+
+
+def estimate_size(hashes, weights):
+    """
+    Returns the estimated orbit size from the member hashes of samples taken
+    with probabilities proportional to weights, or infinity if no member was
+    sampled twice. Expects sum_{i != j} w_i / w_j over pairs of samples to
+    be twice the number of collisions times the orbit size.
+    """
+    collisions = count_collisions(hashes)
+    if not collisions:
+        return float('inf')
+    pair_weights = sum(weights) * sum(1.0 / w for w in weights) - len(weights)
+    return pair_weights / (2 * collisions)
@@ -0,0 +1,132 @@
+# Python packages
+import os
+import pickle
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value BLOB);
+CREATE TABLE IF NOT EXISTS members (
+    label INTEGER PRIMARY KEY,
+    digest BLOB UNIQUE NOT NULL,
+    code BLOB NOT NULL,
+    expanded INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS pending ON members (expanded, label);
+CREATE TABLE IF NOT EXISTS links (
+    source INTEGER NOT NULL,
+    target INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (source, target)
+);
+"""
+
+
+class OrbitStore(object):
+    """
+    SQLite-backed store of an orbit search in directory. Holds the members
+    (keyed by certificate digest, with their compact code and whether they have been
+    expanded) and the links between them. Changes are only made durable by
+    checkpoint(), so a search reopened on the same directory resumes from
+    its last checkpoint.
+    """
+    __slots__ = ('path', 'conn')
+
+    def __init__(self, directory, meta):
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = os.path.join(directory, 'orbit.sqlite')
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        # Checks that an existing store belongs to the same search
+        meta = pickle.dumps(meta, protocol=2)
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'search'")\
+            .fetchone()
+        if row is None:
+            self.conn.execute("INSERT INTO meta VALUES ('search', ?)", (meta,))
+            self.conn.commit()
+        elif bytes(row[0]) != meta:
+            raise ValueError("Directory %s contains a different orbit search"
+                             % directory)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COALESCE(MAX(label), -1) + 1 "
+                                 "FROM members").fetchone()[0]
+
+    def n_expanded(self):
+        """ Returns the number of expanded members """
+        return self.conn.execute("SELECT COUNT(*) FROM members "
+                                 "WHERE expanded = 1").fetchone()[0]
+
+    def find(self, digest):
+        """ Returns the label of the member with certificate digest or None """
+        row = self.conn.execute("SELECT label FROM members WHERE digest = ?",
+                                (digest.to_bytes(16, 'big'),)).fetchone()
+        return None if row is None else row[0]
+
+    def add_member(self, digest, code):
+        """ Adds an unexpanded member and returns its label """
+        label = len(self)
+        code = pickle.dumps(code, protocol=2)
+        self.conn.execute("INSERT INTO members (label, digest, code) "
+                          "VALUES (?, ?, ?)",
+                          (label, digest.to_bytes(16, 'big'), code))
+        return label
+
+    def get_code(self, label):
+        """ Returns the code of a member """
+        row = self.conn.execute("SELECT code FROM members WHERE label = ?",
+                                (label,)).fetchone()
+        return pickle.loads(row[0])
+
+    def pending(self, limit=1):
+        """ Returns up to limit unexpanded member labels, most recent first """
+        cursor = self.conn.execute("SELECT label FROM members "
+                                   "WHERE expanded = 0 ORDER BY label DESC "
+                                   "LIMIT ?", (limit,))
+        return [row[0] for row in cursor]
+
+    def set_expanded(self, label):
+        """ Marks a member as expanded """
+        self.conn.execute("UPDATE members SET expanded = 1 WHERE label = ?",
+                          (label,))
+
+    def add_link(self, source, target, equivs, op_label):
+        """ Adds a local op to the link between two members """
+        source, target = sorted((source, target))
+        row = self.conn.execute("SELECT data FROM links "
+                                "WHERE source = ? AND target = ?",
+                                (source, target)).fetchone()
+        if row is None:
+            data = ([op_label], [equivs])
+        else:
+            data = pickle.loads(row[0])
+            if op_label in data[0]:
+                return
+            data[0].append(op_label)
+            data[1].append(equivs)
+        self.conn.execute("INSERT OR REPLACE INTO links VALUES (?, ?, ?)",
+                          (source, target, pickle.dumps(data, protocol=2)))
+
+    def members(self):
+        """ Yields the label, certificate digest and code of every member """
+        cursor = self.conn.execute("SELECT label, digest, code FROM members "
+                                   "ORDER BY label")
+        for label, digest, code in cursor:
+            yield label, int.from_bytes(digest, 'big'), pickle.loads(code)
+
+    def links(self):
+        """ Yields the source, target, ops and equivs of every link """
+        cursor = self.conn.execute("SELECT source, target, data FROM links "
+                                   "ORDER BY source, target")
+        for source, target, data in cursor:
+            ops, equivs = pickle.loads(data)
+            yield source, target, ops, equivs
+
+    def checkpoint(self):
+        """ Makes all changes since the last checkpoint durable """
+        self.conn.commit()
+
+    def close(self):
+        """ Closes the store, discarding changes since the last checkpoint """
+        self.conn.close()
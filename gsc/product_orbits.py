@@ -0,0 +1,130 @@
+# Python packages
+import networkx as nx
+import itertools as it
+from collections import Counter
+# Local modules
+from gsc.utils import copy_graph_attrs
+from gsc.get_nauty import hash_graph, find_isomorphism
+
+
+class ProductOrbit(object):
+    """
+    LC orbit, up to isomorphism, of a disconnected graph, held as the class
+    graphs of its components' orbits. Components in the same orbit share one
+    class graph, so each member of the product picks a multiset of that
+    orbit's members for them. Members are only built when iterated over.
+    """
+    __slots__ = ('graph', 'factors')
+
+    def __init__(self, graph, factors):
+        # factors holds each distinct component orbit's class graph and the
+        # node maps from its members onto each component in that orbit
+        self.graph = graph
+        self.factors = factors
+
+    @classmethod
+    def from_components(cls, graph, explore):
+        """
+        Builds the product orbit of graph, calling explore on the first
+        component found in each distinct component orbit
+        """
+        order = {node: i for i, node in enumerate(graph)}
+        factors = []
+        for nodes in sorted(nx.connected_components(graph),
+                            key=lambda c: min(order[node] for node in c)):
+            component = copy_graph_attrs(graph, graph.subgraph(
+                [node for node in graph if node in nodes]).copy())
+            graph_hash = hash_graph(component)
+            # Maps an explored orbit's members onto an equivalent component
+            for class_graph, relabels in factors:
+                label = class_graph.member_hash_table.get(graph_hash)
+                if label is not None:
+                    relabels.append(find_isomorphism(
+                        class_graph.nodes[label]['nx_graph'], component))
+                    break
+            else:
+                factors.append((explore(component),
+                                [{node: node for node in component}]))
+        return cls(graph, factors)
+
+    def size(self):
+        """ Returns the number of members of the orbit """
+        return sum(self.edge_counts().values())
+
+    def edge_counts(self):
+        """ Returns the histogram of member edge counts """
+        counts = Counter({0: 1})
+        for class_graph, relabels in self.factors:
+            factor_counts = multiset_edge_counts(member_edge_counts(
+                class_graph), len(relabels))
+            product_counts = Counter()
+            for (m, count), (n, factor_count) \
+                    in it.product(counts.items(), factor_counts.items()):
+                product_counts[m + n] += count * factor_count
+            counts = product_counts
+        return dict(counts)
+
+    def members(self):
+        """ Yields the NetworkX graph of every member of the orbit """
+        return self.iter_graphs(self.factor_labels())
+
+    def min_edge_reps(self):
+        """ Yields the NetworkX graphs of the minimum edge representatives """
+        return self.iter_graphs(self.factor_labels(min))
+
+    def max_edge_reps(self):
+        """ Yields the NetworkX graphs of the maximum edge representatives """
+        return self.iter_graphs(self.factor_labels(max))
+
+    def factor_labels(self, select=None):
+        """
+        Returns the member labels of each factor, only keeping those whose
+        edge count is select (min or max) of the factor's if given
+        """
+        labels = []
+        for class_graph, _ in self.factors:
+            edge_counts = member_edge_counts(class_graph)
+            best = None if select is None else select(edge_counts)
+            labels.append([label for label, n_edges in enumerate(edge_counts)
+                           if best is None or n_edges == best])
+        return labels
+
+    def iter_graphs(self, labels):
+        """
+        Yields the graphs for every choice of a multiset of each factor's
+        labels for its components
+        """
+        choices = [it.combinations_with_replacement(factor_labels,
+                                                    len(relabels))
+                   for factor_labels, (_, relabels)
+                   in zip(labels, self.factors)]
+        for choice in it.product(*choices):
+            graph = nx.Graph()
+            graph.add_nodes_from(self.graph.nodes())
+            for member_labels, (class_graph, relabels) \
+                    in zip(choice, self.factors):
+                for label, relabel in zip(member_labels, relabels):
+                    graph.add_weighted_edges_from(
+                        (relabel[u], relabel[v], w)
+                        for u, v, w in class_graph.nodes[label]['edges'])
+            yield copy_graph_attrs(self.graph, graph)
+
+
+def member_edge_counts(class_graph):
+    """ Returns the edge count of each class graph member, by label """
+    return [len(class_graph.nodes[label]['edges'])
+            for label in range(class_graph.number_of_nodes())]
+
+
+def multiset_edge_counts(edge_counts, k):
+    """
+    Returns the histogram of total edge counts over all multisets of k
+    members with the given edge counts
+    """
+    # Counts multisets of each size by total edges, adding members in turn
+    counts = [Counter({0: 1})] + [Counter() for _ in range(k)]
+    for n_edges in edge_counts:
+        for size in range(1, k + 1):
+            for total, count in list(counts[size - 1].items()):
+                counts[size][total + n_edges] += count
+    return counts[k]
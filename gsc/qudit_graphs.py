@@ -0,0 +1,220 @@
+# Python packages
+import numpy as np
+import networkx as nx
+from functools import lru_cache
+
+
+class QuditGraph(object):
+    """
+    Lightweight graph state with explicit dimension metadata. Edge weights
+    are held in a symmetric n x n array whose rows and columns follow nodes.
+    Prime-power graphs have nodes (n, i) for family n and member i.
+    """
+    __slots__ = ('nodes', 'index', 'weights', 'prime', 'power', 'families')
+
+    def __init__(self, nodes, weights, prime=2, power=1, families=None,
+                 index=None):
+        self.nodes = tuple(nodes)
+        self.index = index if index is not None \
+            else {node: i for i, node in enumerate(self.nodes)}
+        self.weights = weights
+        self.prime = prime
+        self.power = power
+        self.families = families
+
+    @classmethod
+    def from_nx(cls, graph):
+        """ Creates a QuditGraph from a NetworkX graph and its attributes """
+        nodes = list(graph.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        weights = np.zeros((len(nodes), len(nodes)), dtype=np.uint8)
+        for u, v, w in graph.edges(data='weight', default=1):
+            weights[index[u], index[v]] = weights[index[v], index[u]] = w
+        attrs = graph.__dict__
+        return cls(nodes, weights, prime=attrs.get('prime', 2),
+                   power=attrs.get('power', 1),
+                   families=attrs.get('families'), index=index)
+
+    def to_nx(self):
+        """ Returns the equivalent NetworkX graph with its attributes """
+        graph = nx.Graph()
+        graph.add_nodes_from(self.nodes)
+        graph.add_weighted_edges_from(self.edges())
+        graph.prime, graph.power = self.prime, self.power
+        graph.dimension = self.dimension
+        if self.families is not None:
+            graph.families = self.families
+        return graph
+
+    @property
+    def dimension(self):
+        return self.prime ** self.power
+
+    def copy(self, weights=None):
+        """
+        Returns a copy sharing the (immutable) node data, with a copy of the
+        weights or the given new weights
+        """
+        weights = self.weights.copy() if weights is None else weights
+        return QuditGraph(self.nodes, weights, self.prime, self.power,
+                          self.families, self.index)
+
+    def key(self):
+        """ Returns a hashable key identifying the labelled graph """
+        return self.weights.tobytes()
+
+    def edges(self):
+        """ Returns the weighted edges (u, v, w) in upper-triangle order """
+        us, vs = np.nonzero(np.triu(self.weights))
+        nodes = self.nodes
+        return [(nodes[i], nodes[j], int(self.weights[i, j]))
+                for i, j in zip(us.tolist(), vs.tolist())]
+
+    def index_edges(self):
+        """ Returns the weighted edges (i, j, w) of node indices """
+        us, vs = np.nonzero(np.triu(self.weights))
+        return [(i, j, int(self.weights[i, j]))
+                for i, j in zip(us.tolist(), vs.tolist())]
+
+    def neighbors(self, node):
+        """ Returns the indices of the neighbours of node index """
+        return np.flatnonzero(self.weights[node]).tolist()
+
+    def degree(self, node):
+        """ Returns the degree of node index """
+        return int(np.count_nonzero(self.weights[node]))
+
+    def number_of_nodes(self):
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        return int(np.count_nonzero(self.weights)) // 2
+
+
+def graph_attr(graph, attr, default=None):
+    """ Returns a graph state attribute of a QuditGraph or NetworkX graph """
+    if isinstance(graph, QuditGraph):
+        return getattr(graph, attr)
+    return graph.__dict__.get(attr, default)
+
+
+def qudit_LC(graph, node, a, copy=True):
+    """
+    Returns the QuditGraph for generalised local complementation applied to
+    node index with weight a
+    """
+    neigh_ws = graph.weights[node].astype(np.intp)
+    update = a * np.outer(neigh_ws, neigh_ws)
+    np.fill_diagonal(update, 0)
+    weights = ((graph.weights + update) % graph.prime).astype(np.uint8)
+    if copy:
+        return graph.copy(weights)
+    graph.weights = weights
+    return graph
+
+
+def qudit_EM(graph, node, b, copy=True):
+    """
+    Returns the QuditGraph for edge multiplication applied to node index
+    with weight b
+    """
+    em_graph = graph.copy() if copy else graph
+    row = (em_graph.weights[node].astype(np.intp) * b) % graph.prime
+    em_graph.weights[node, :] = row
+    em_graph.weights[:, node] = row
+    return em_graph
+
+
+def scaled_row_children(graph, node, weights, neigh_ws):
+    """
+    Returns weights (as an intp array) with the node's row and column
+    scaled by each b = 2..p-1, stacked along the first axis
+    """
+    p = graph.prime
+    em_weights = np.repeat(weights[None], p - 2, axis=0)
+    em_rows = (np.arange(2, p)[:, None] * neigh_ws) % p
+    em_weights[:, node, :] = em_rows
+    em_weights[:, :, node] = em_rows
+    return em_weights
+
+
+def qudit_LC_EM_children(graph, node):
+    """
+    Returns the QuditGraphs for generalised local complementation with every
+    weight a = 1..p-1 followed by those for edge multiplication with every
+    weight b = 2..p-1 applied to node index, computed in one batch.
+    LC children of nodes with fewer than two neighbours are the graph itself
+    and are returned as None.
+    """
+    p = graph.prime
+    weights = graph.weights.astype(np.intp)
+    neigh_ws = weights[node]
+    em_weights = scaled_row_children(graph, node, weights, neigh_ws)
+    if np.count_nonzero(neigh_ws) < 2:
+        return [None] * (p - 1) + \
+            [graph.copy(child.copy()) for child in em_weights.astype(np.uint8)]
+    update = np.outer(neigh_ws, neigh_ws)
+    np.fill_diagonal(update, 0)
+    # Stacks the weights for every LC_a and EM_b along the first axis
+    lc_weights = (weights + np.arange(1, p)[:, None, None] * update) % p
+    children = np.concatenate([lc_weights, em_weights]).astype(np.uint8)
+    # Copies each child so that kept children do not hold the whole batch
+    return [graph.copy(child.copy()) for child in children]
+
+
+@lru_cache(maxsize=256)
+def family_mask(nodes):
+    """ Returns the mask of intra-family entries of a prime-power graph """
+    family = np.array([u for u, _ in nodes])
+    return family[:, None] == family[None, :]
+
+
+def qudit_CC_EM_children(graph, node):
+    """
+    Returns the prime-power QuditGraphs for controlled complementation of
+    node index with every weight a = 1..p-1 onto every member t of its
+    family (ordered by a then t), followed by those for edge multiplication
+    with every weight b = 2..p-1, computed in one batch. CC children onto
+    the control itself are the graph itself for controls with fewer than two
+    neighbours and are returned as None.
+    """
+    p, m = graph.prime, graph.power
+    weights = graph.weights.astype(np.intp)
+    n, c = graph.nodes[node]
+    targets = [graph.index[(n, t)] for t in range(m)]
+    # Adds the control-target edge to the control's neighbours for each t
+    neigh_ws = np.repeat(weights[node][None], m, axis=0)
+    neigh_ws[range(m), targets] = 1
+    neigh_ws[c, node] = 0
+    updates = neigh_ws[:, :, None] * neigh_ws[:, None, :]
+    updates[:, range(len(weights)), range(len(weights))] = 0
+    # Stacks the weights for every CC_a,t (with intra-family entries, incl.
+    # the control-target edges, masked out) and EM_b along the first axis
+    a = np.arange(1, p)[:, None, None, None]
+    cc_weights = ((weights + a * updates) % p).reshape((-1,) + weights.shape)
+    cc_weights[:, family_mask(graph.nodes)] = 0
+    em_weights = scaled_row_children(graph, node, weights, weights[node])
+    children = np.concatenate([cc_weights, em_weights]).astype(np.uint8)
+    # Copies each child so that kept children do not hold the whole batch
+    children = [graph.copy(child.copy()) for child in children]
+    if np.count_nonzero(weights[node]) < 2:
+        children[c:(p - 1) * m:m] = [None] * (p - 1)
+    return children
+
+
+def qudit_CC(graph, node, t, a, copy=True):
+    """
+    Returns the prime-power QuditGraph after controlled complementation of
+    node index onto member t of its family
+    """
+    new_graph = graph.copy() if copy else graph
+    n, c = graph.nodes[node]
+    # Adds edge between control and target node
+    if c != t:
+        target = graph.index[(n, t)]
+        new_graph.weights[node, target] = new_graph.weights[target, node] = 1
+    # Applies LC to control
+    new_graph = qudit_LC(new_graph, node, a, copy=False)
+    # Removes any intra-family edges
+    new_graph.weights[family_mask(graph.nodes)] = 0
+    return new_graph
@@ -0,0 +1,133 @@
+# Python packages
+import sys
+import json
+from time import perf_counter
+from contextlib import contextmanager
+from collections import Counter
+
+
+class SearchMetrics(object):
+    """
+    Counters and cumulative timers (in seconds) of the phases of an orbit
+    search. Timed phases are 'orbits' (finding representative nodes),
+    'children' (applying local ops) and 'certificates' (running nauty).
+    Counts are of 'expanded' members, 'children', 'noop_children' (equal to
+    their parent), 'inverse_children' (known to be the parent),
+    'certificates' computed, 'cert_cache_hits' and 'dedup_hits' and
+    'dedup_misses' (children already in or new to the class).
+    """
+    __slots__ = ('counts', 'times')
+
+    def __init__(self):
+        self.counts = Counter()
+        self.times = Counter()
+
+    def as_dict(self):
+        """ Returns the counts and times as a dictionary """
+        return {'counts': dict(self.counts), 'times': dict(self.times)}
+
+
+def timed(metrics, phase, func, *args):
+    """ Returns func(*args), adding its run time to phase of metrics if given """
+    if metrics is None:
+        return func(*args)
+    start = perf_counter()
+    result = func(*args)
+    metrics.times[phase] += perf_counter() - start
+    return result
+
+
+class SearchTracer(object):
+    """
+    Receives the progress of an orbit search. The search calls start, then
+    progress before expanding each member and finish once done. At most one
+    progress event is passed on every interval seconds, as a dictionary of
+    the 'event', 'elapsed' time, members 'visited' and 'known', members
+    visited 'per_second' and any metrics, to callback (if given) or emit.
+    """
+
+    def __init__(self, callback=None, interval=1.0):
+        self.callback = callback
+        self.interval = interval
+        self.start_time = self.last_time = None
+
+    def start(self):
+        self.start_time = self.last_time = perf_counter()
+        self.trace('start', 0, 1)
+
+    def progress(self, visited, known, metrics=None):
+        now = perf_counter()
+        if now - self.last_time >= self.interval:
+            self.last_time = now
+            self.trace('progress', visited, known, metrics)
+
+    def finish(self, visited, known, metrics=None):
+        self.trace('finish', visited, known, metrics)
+
+    def trace(self, event, visited, known, metrics=None):
+        elapsed = perf_counter() - self.start_time
+        data = {'event': event, 'elapsed': elapsed, 'visited': visited,
+                'known': known,
+                'per_second': visited / elapsed if elapsed else 0.0}
+        if metrics is not None:
+            data.update(metrics.as_dict())
+        self.emit(data)
+
+    def emit(self, data):
+        if self.callback is not None:
+            self.callback(data)
+
+
+class JSONLTracer(SearchTracer):
+    """ Writes search events to stream as lines of JSON """
+
+    def __init__(self, stream, interval=1.0):
+        super(JSONLTracer, self).__init__(interval=interval)
+        self.stream = stream
+
+    def emit(self, data):
+        self.stream.write(json.dumps(data) + '\n')
+        self.stream.flush()
+
+
+class VerboseTracer(SearchTracer):
+    """ Prints the live count of visited and known members to stdout """
+
+    def __init__(self, interval=0.1):
+        super(VerboseTracer, self).__init__(interval=interval)
+
+    def trace(self, event, visited, known, metrics=None):
+        sys.stdout.write('%d/%d visited (%d%%)\r' %
+                         (visited, known, int(100 * float(visited) / known)))
+        if event == 'finish':
+            sys.stdout.write('\n')
+        sys.stdout.flush()
+
+
+@contextmanager
+def profile_search(cprofile=True, memory=True):
+    """
+    Profiles the code run in the context, e.g. an orbit search. Yields a
+    dictionary that afterwards holds the 'stats' (pstats.Stats) of cProfile
+    and the 'peak_memory' (in bytes) and 'memory_snapshot' of tracemalloc.
+    """
+    # Imports the profilers on first use, as they are rarely needed
+    import cProfile
+    import pstats
+    import tracemalloc
+    profile = {}
+    profiler = cProfile.Profile() if cprofile else None
+    if memory:
+        tracemalloc.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield profile
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profile['stats'] = pstats.Stats(profiler)
+        if memory:
+            profile['peak_memory'] = tracemalloc.get_traced_memory()[1]
+            profile['memory_snapshot'] = tracemalloc.take_snapshot()
+            tracemalloc.stop()
@@ -2,28 +2,52 @@
 import numpy as np
 from math import sqrt
 from itertools import chain, combinations
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from math import pi, cos, sin
-from abp import GraphState
-from abp.util import xyz
 
 
 def copy_graph(graph):
     """ Returns copy of graph including graph attributes """
-    graph_copy = graph.copy()
-    attrs = set(dir(graph))
-    attrs_copy = set(dir(graph_copy))
-    for attr in attrs - attrs_copy:
-        graph_copy.__dict__[attr] = graph.__dict__[attr]
+    return copy_graph_attrs(graph, graph.copy())
+
+
+def copy_graph_attrs(graph, graph_copy):
+    """ Copies any graph attributes missing from graph_copy from graph """
+    # Skips class attributes (e.g. cached views of NetworkX graphs)
+    attrs_copy, cls = graph_copy.__dict__, type(graph_copy)
+    for attr, value in graph.__dict__.items():
+        if attr not in attrs_copy and not hasattr(cls, attr):
+            attrs_copy[attr] = value
     return graph_copy
 
 
+class LRUCache(OrderedDict):
+    """ Dictionary of at most maxsize items that evicts the least recently used """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        super(LRUCache, self).__init__()
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+    def __setitem__(self, key, value):
+        super(LRUCache, self).__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
 def canonical_edge_order(edges):
     return tuple(sorted(tuple(sorted(edge)) for edge in edges))
 
 
 def circular_positions(nodes, r):
     """ Assigns circular coordinates to a set of crazy nodes """
+    from abp.util import xyz
     n = len(nodes)
     thetas = np.linspace(0, 2 * pi, n)[:-1]
     x_y_pos = [(nodes[0], (0, 0))]
@@ -39,6 +63,9 @@ def to_GraphState(graph, r=0.2):
     Converts a NetworkX graph into a GraphState.
     If graph is crazy, lays out crazy nodes radially.
     """
+    # Imports abp on first use, as it is slow to import and only needed here
+    from abp import GraphState
+    from abp.util import xyz
     # Defines qubits and coordinates for crazy or normal graph
     if hasattr(graph, 'encoded'):
         crazy_nodes = defaultdict(list)
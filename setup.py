@@ -12,7 +12,6 @@ setup(
     install_requires=[
         'abp',
         'numpy',
-        'sympy',
         'matplotlib',
         'networkx'
     ],
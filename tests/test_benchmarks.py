@@ -0,0 +1,45 @@
+# Python packages
+import json
+# Local modules
+from gsc.benchmarks import (
+    run_benchmarks,
+    compare_results,
+    import_time,
+    main,
+    IMPORT_BUDGET,
+)
+
+
+def test_benchmarks():
+    """ Tests benchmark results are reproducible and compared to baselines """
+    results = run_benchmarks(['orbit_linear_9', 'orbit_prime_p5_path_5'],
+                             repeat=1)
+    again = run_benchmarks(['orbit_linear_9', 'orbit_prime_p5_path_5'],
+                           repeat=1)
+    for name, result in results['results'].items():
+        assert result['members'] == again['results'][name]['members']
+        assert result['nauty_calls'] == again['results'][name]['nauty_calls']
+        assert result['wall_time'] > 0 and result['peak_memory'] > 0
+    # Flags results slower than a baseline
+    baseline = json.loads(json.dumps(results))
+    baseline['results']['orbit_linear_9']['wall_time'] /= 2
+    regressed = {(name, metric) for name, metric, _, _, _, regressed
+                 in compare_results(results, baseline) if regressed}
+    assert regressed == {('orbit_linear_9', 'wall_time')}
+
+
+def test_benchmarks_main(tmp_path):
+    """ Tests the command line writes results and checks a baseline """
+    output = str(tmp_path / 'results.json')
+    assert main(['orbit_linear_9', '--repeat', '1', '--output', output]) == 0
+    with open(output) as f:
+        assert set(json.load(f)['results']) == {'orbit_linear_9'}
+    assert main(['orbit_linear_9', '--repeat', '1', '--baseline', output,
+                 '--threshold', '1000']) == 0
+
+
+def test_import_budget():
+    """ Tests importing the search is fast and skips optional dependencies """
+    seconds, loaded = import_time('gsc.explore_lc_orbit')
+    assert loaded == []
+    assert seconds < IMPORT_BUDGET
@@ -0,0 +1,56 @@
+# Python packages
+import random
+import networkx as nx
+# Local modules
+from gsc.utils import canonical_edge_order
+from gsc.get_nauty import hash_graph, find_rep_nodes
+from gsc.explore_lc_orbit import qubit_LC
+from gsc.bit_graphs import (
+    to_bit_graph,
+    from_bit_graph,
+    bit_graph_edges,
+    bit_qubit_LC,
+)
+
+
+def test_bit_graph_round_trip():
+    """ Tests converting to and from bit graphs preserves the graph """
+    for _ in range(100):
+        g = gen_random_connected_graph(12)
+        nodes = list(g.nodes())
+        bit_g = to_bit_graph(g, nodes)
+        rt_g = from_bit_graph(bit_g, nodes)
+        assert list(rt_g.nodes()) == nodes
+        assert canonical_edge_order(rt_g.edges()) == \
+            canonical_edge_order(g.edges())
+        assert len(bit_graph_edges(bit_g)) == g.number_of_edges()
+
+
+def test_bit_qubit_LC():
+    """ Tests bit graph local complementation against NetworkX version """
+    for _ in range(100):
+        g = gen_random_connected_graph(12)
+        nodes = list(g.nodes())
+        bit_g = to_bit_graph(g, nodes)
+        lc_node = random.choice(nodes)
+        lc_g = qubit_LC(g, lc_node)
+        lc_bit_g = bit_qubit_LC(bit_g, nodes.index(lc_node))
+        assert lc_bit_g == to_bit_graph(lc_g, nodes)
+        assert bit_qubit_LC(lc_bit_g, nodes.index(lc_node)) == bit_g
+
+
+def test_bit_graph_nauty():
+    """ Tests bit graph hashes and orbits match the NetworkX versions """
+    for _ in range(100):
+        g = gen_random_connected_graph(10)
+        bit_g = to_bit_graph(g, range(10))
+        assert hash_graph(bit_g) == hash_graph(g)
+        assert find_rep_nodes(bit_g) == find_rep_nodes(g)
+
+
+def gen_random_connected_graph(n, p=0.333):
+    """ Generates a Erdos-Renyi G_n,p random graph """
+    g = nx.fast_gnp_random_graph(n, p)
+    while not nx.is_connected(g):
+        g = nx.fast_gnp_random_graph(n, p)
+    return g
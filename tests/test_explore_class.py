@@ -1,12 +1,37 @@
 # Python packages
+import pytest
 import random
 import networkx as nx
 from abp import GraphState
 # Local modules
-from gsc.utils import canonical_edge_order
+from gsc.utils import canonical_edge_order, copy_graph_attrs, LRUCache
+from gsc.bit_graphs import to_bit_graph, bit_qubit_LC
 from gsc.is_lc_equiv import are_lc_equiv
-from gsc.explore_lc_orbit import qubit_LC, explore_lc_orbit
-from gsc.graph_builders import create_prime_power_graph
+from gsc.get_nauty import (
+    hash_graph,
+    graph_certificate,
+    CertificateCollisionError,
+)
+from gsc.explore_lc_orbit import (
+    qubit_LC,
+    explore_lc_orbit,
+    queued_orbit_search,
+    expand_member,
+    iter_lc_orbit,
+    verify_certificate,
+    get_min_edge_reps,
+    get_max_edge_reps,
+    find_lc_path,
+    apply_lc_path,
+    find_min_edge_reps,
+    apply_qubit_LCs,
+    invert_op_label,
+    init_orbit_search,
+    prime_qudit_LC,
+    prime_qudit_EM,
+)
+from gsc.graph_builders import create_prime_graph, create_prime_power_graph
+from gsc.search_tracing import SearchMetrics, SearchTracer
 
 
 def test_qubit_LC():
@@ -57,6 +82,229 @@ def test_explore_lc_orbit():
             assert lc_equiv
 
 
+def test_parallel_explore_lc_orbit():
+    """ Tests parallel orbit search returns the serial class graph """
+    for _ in range(3):
+        g = gen_random_connected_graph(7)
+        class_graph = explore_lc_orbit(g, verbose=False)
+        par_class_graph = explore_lc_orbit(g, verbose=False, workers=2)
+        assert dict(class_graph.nodes(data='edges')) == \
+            dict(par_class_graph.nodes(data='edges'))
+        assert sorted(class_graph.edges(data='ops')) == \
+            sorted(par_class_graph.edges(data='ops'))
+
+
+def test_compact_explore_lc_orbit():
+    """ Tests compact member storage returns the same class graph """
+    for _ in range(3):
+        g = gen_random_connected_graph(7)
+        class_graph = explore_lc_orbit(g, verbose=False)
+        compact_class_graph = explore_lc_orbit(g, verbose=False, compact=True)
+        for node, data in class_graph.nodes(data=True):
+            compact_data = compact_class_graph.nodes[node]
+            assert data['edges'] == compact_data['edges']
+            assert data['hash'] == compact_data['hash']
+            assert nx.utils.graphs_equal(data['nx_graph'],
+                                         compact_data['nx_graph'])
+
+
+def test_cert_cache():
+    """ Tests caching certificates by labelled graph keeps the class graph """
+    g = gen_random_connected_graph(7)
+    class_graph = explore_lc_orbit(g, verbose=False)
+    init_state = to_bit_graph(g, list(g.nodes()))
+    cached_class_graph = queued_orbit_search(init_state, [('LC', bit_qubit_LC)],
+                                             True, False)
+    uncached_class_graph = queued_orbit_search(init_state,
+                                               [('LC', bit_qubit_LC)],
+                                               True, False, cert_cache_size=0)
+    for other in (cached_class_graph, uncached_class_graph):
+        assert [data['hash'] for _, data in other.nodes(data=True)] == \
+            [data['hash'] for _, data in class_graph.nodes(data=True)]
+        assert sorted(other.edges()) == sorted(class_graph.edges())
+    # Checks nauty is only run on labelled graphs not seen before
+    cert_cache = LRUCache(100)
+    children = expand_member(init_state, [('LC', bit_qubit_LC)],
+                             keep_nauty=True, cert_cache=cert_cache)
+    assert all(nauty_g is not None for *_, nauty_g in children)
+    cached_children = expand_member(init_state, [('LC', bit_qubit_LC)],
+                                    keep_nauty=True, cert_cache=cert_cache)
+    assert [child[3] for child in cached_children] == \
+        [child[3] for child in children]
+    assert all(nauty_g is None for *_, nauty_g in cached_children)
+
+
+def test_inverse_pruning():
+    """ Tests skipping inverse local ops keeps the class graph """
+    for g in (gen_random_connected_graph(7),
+              create_prime_graph([(0, 1, 1), (1, 2, 2), (2, 3, 1)], 5)):
+        _, _, _, local_ops, init_state = init_orbit_search(g)
+        p = g.__dict__.get('prime', 2)
+        class_graphs = [queued_orbit_search(init_state, local_ops, True,
+                                            False, invert_op=invert_op)
+                        for invert_op in (None, lambda op_label:
+                                          invert_op_label(op_label, p))]
+        for class_graph in class_graphs[1:]:
+            assert [data['hash'] for _, data in class_graph.nodes(data=True)] \
+                == [data['hash'] for _, data
+                    in class_graphs[0].nodes(data=True)]
+            assert sorted(class_graph.edges(data='ops')) == \
+                sorted(class_graphs[0].edges(data='ops'))
+    # Checks the inverse op is returned as the parent without applying it
+    g = nx.path_graph(4)
+    init_state = to_bit_graph(g, list(g.nodes()))
+    children = expand_member(init_state, [('LC', bit_qubit_LC)],
+                             inverse=(1, 'LC'))
+    assert [child[:3] for child in children] == \
+        [([1, 2], 'LC', None)]
+
+
+def test_bounded_explore_lc_orbit():
+    """ Tests bounded searches return resumable partial class graphs """
+    g = nx.cycle_graph(7)
+    class_graph = explore_lc_orbit(g, verbose=False)
+    distances = nx.single_source_shortest_path_length(class_graph, 0)
+    # Checks depth-bounded searches find the members within max_depth
+    partial_class_graph = explore_lc_orbit(g, verbose=False, max_depth=2)
+    assert set(partial_class_graph.member_hash_table) == \
+        set(class_graph.nodes[label]['hash']
+            for label, distance in distances.items() if distance <= 2)
+    assert all(depth == 2 and not partial_class_graph.nodes[label]['expanded']
+               for label, depth in partial_class_graph.graph['frontier'])
+    for kwargs in ({'max_members': 5}, {'time_limit': 0},
+                   {'cancel': lambda: True}):
+        partial_class_graph = explore_lc_orbit(g, verbose=False, **kwargs)
+        assert len(partial_class_graph) < len(class_graph)
+        # Resumes the search a few members at a time until complete
+        while 'frontier' in partial_class_graph.graph:
+            partial_class_graph = explore_lc_orbit(
+                g, verbose=False, resume=partial_class_graph,
+                max_members=len(partial_class_graph) + 5)
+        assert set(partial_class_graph.member_hash_table) == \
+            set(class_graph.member_hash_table)
+        assert partial_class_graph.number_of_edges() == \
+            class_graph.number_of_edges()
+    with pytest.raises(ValueError):
+        explore_lc_orbit(g, verbose=False, resume=class_graph)
+
+
+def test_verify_certificates():
+    """ Tests certificate verification detects digest collisions """
+    g = gen_random_connected_graph(6)
+    class_graph = explore_lc_orbit(g, verbose=False, verify=True)
+    graph_hash = class_graph.nodes[0]['hash']
+    assert class_graph.member_cert_table[graph_hash] == graph_certificate(g)
+    verify_certificate(class_graph, graph_hash, graph_certificate(g))
+    with pytest.raises(CertificateCollisionError):
+        verify_certificate(class_graph, graph_hash,
+                           graph_certificate(nx.complete_graph(6)))
+
+
+def test_iter_lc_orbit():
+    """ Tests streamed members match the class graph's members """
+    qutrit_g = create_prime_graph([(0, 1, 1), (1, 2, 2), (2, 3, 1)], 3)
+    for g in [gen_random_connected_graph(7), qutrit_g]:
+        class_graph = explore_lc_orbit(g, verbose=False)
+        members = dict(iter_lc_orbit(g, nx_graphs=True))
+        assert sorted(members) == sorted(class_graph.nodes())
+        for label, data in members.items():
+            assert data['hash'] == class_graph.nodes[label]['hash']
+            assert sorted(data['edges']) == \
+                sorted(class_graph.nodes[label]['edges'])
+            assert nx.utils.graphs_equal(data['nx_graph'],
+                                         class_graph.nodes[label]['nx_graph'])
+            if label:
+                assert data['op'] in \
+                    class_graph[data['parent']][label]['ops']
+    # Checks the search can be stopped early
+    members = iter_lc_orbit(nx.path_graph(7))
+    assert next(members)[1]['parent'] is None
+    assert next(members)[1]['parent'] == 0
+
+
+def test_lc_orbit_census():
+    """ Tests the orbit census matches the aggregates of the class graph """
+    for _ in range(3):
+        g = gen_random_connected_graph(7)
+        class_graph = explore_lc_orbit(g, verbose=False)
+        census = explore_lc_orbit(g, verbose=False, census=True)
+        assert census['size'] == class_graph.number_of_nodes()
+        edge_counts = [len(data['edges'])
+                       for data in class_graph.nodes.values()]
+        assert census['edge_counts'] == \
+            {n: edge_counts.count(n) for n in sorted(set(edge_counts))}
+        assert set(census['min_edge_reps']) == \
+            set(get_min_edge_reps(class_graph))
+        assert set(census['max_edge_reps']) == \
+            set(get_max_edge_reps(class_graph))
+    for kwargs in ({'compact': True}, {'max_members': 3},
+                   {'max_depth': 1}, {'time_limit': 1.0},
+                   {'cancel': lambda: False}, {'resume': class_graph},
+                   {'metrics': SearchMetrics()}, {'tracer': SearchTracer()}):
+        with pytest.raises(ValueError):
+            explore_lc_orbit(g, verbose=False, census=True, **kwargs)
+
+
+def test_find_lc_path():
+    """ Tests LC paths are shortest paths between class graph members """
+    qutrit_g = create_prime_graph([(0, 1, 1), (1, 2, 2), (2, 3, 1)], 3)
+    pp_g = create_prime_power_graph([((0, 0), (1, 0), 1),
+                                     ((0, 1), (2, 1), 1)], 2, 2)
+    for g in [gen_random_connected_graph(7), qutrit_g, pp_g]:
+        class_graph = explore_lc_orbit(g, verbose=False)
+        labels = list(class_graph.nodes())
+        for label in random.sample(labels, min(5, len(labels))):
+            target = class_graph.nodes[label]['nx_graph']
+            path = find_lc_path(g, target)
+            length = nx.shortest_path_length(class_graph, 0, label)
+            # Prime-power class graph links may have no inverse single op
+            if g is pp_g:
+                assert len(path) >= length
+            else:
+                assert len(path) == length
+            assert hash_graph(apply_lc_path(g, path)) == hash_graph(target)
+    # Checks paths to relabelled graphs and between inequivalent graphs
+    g = gen_random_connected_graph(7)
+    lc_g = apply_qubit_LCs(g, [random.randrange(7) for _ in range(4)])
+    lc_g = nx.relabel_nodes(lc_g, dict(zip(range(7), [3, 6, 0, 1, 5, 2, 4])))
+    assert hash_graph(apply_lc_path(g, find_lc_path(g, lc_g))) == \
+        hash_graph(lc_g)
+    lc_g = prime_qudit_EM(prime_qudit_LC(qutrit_g, 1, 2), 2, 2)
+    assert len(find_lc_path(qutrit_g, lc_g)) <= 2
+    assert find_lc_path(nx.path_graph(5), nx.star_graph(4)) is None
+    # Checks graphs with different node names
+    p3 = nx.path_graph(3)
+    assert find_lc_path(p3, nx.relabel_nodes(p3, dict(zip(p3, 'abc')))) == []
+    lc_g = prime_qudit_EM(prime_qudit_LC(qutrit_g, 1, 2), 2, 2)
+    named_g = copy_graph_attrs(lc_g, nx.relabel_nodes(
+        lc_g, {node: 'q%d' % node for node in lc_g}))
+    path = find_lc_path(qutrit_g, named_g)
+    assert hash_graph(apply_lc_path(qutrit_g, path)) == hash_graph(named_g)
+
+
+def test_find_min_edge_reps():
+    """ Tests best-first MER search against the class graph's MERs """
+    for _ in range(3):
+        g = gen_random_connected_graph(7)
+        class_graph = explore_lc_orbit(g, verbose=False)
+        mers = get_min_edge_reps(class_graph).values()
+        mer_hashes = set(data['hash'] for data in mers)
+        min_edges = min(len(data['edges']) for data in mers)
+        min_edge_reps, optimal = find_min_edge_reps(g)
+        assert optimal
+        assert set(data['hash'] for data in min_edge_reps.values()) == \
+            mer_hashes
+        # Checks budgeted search returns valid representatives
+        min_edge_reps, _ = find_min_edge_reps(g, max_expansions=2)
+        assert all(len(data['edges']) >= min_edges
+                   for data in min_edge_reps.values())
+    # Checks searches stop once a tree is found
+    min_edge_reps, optimal = find_min_edge_reps(nx.complete_graph(8),
+                                                stop_at_bound=True)
+    assert optimal
+    assert [len(data['edges']) for data in min_edge_reps.values()] == [7]
+
+
 def test_ququart_pair():
     """ Tests working for ququart entangled pair LC classes """
     # Tests first equivalence class
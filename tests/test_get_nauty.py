@@ -1,10 +1,23 @@
 # Python packages
+import os
+import sys
 import random
+import subprocess
+import pynauty as pyn
 import networkx as nx
 # Local modules
-from gsc.get_nauty import find_rep_nodes, hash_graph, canonical_relabel
+from gsc.get_nauty import (
+    find_rep_nodes,
+    hash_graph,
+    canonical_relabel,
+    graph_certificate,
+    certificate_digest,
+    convert_nx_to_pyn,
+    nauty_graph,
+    analyse_graph,
+)
 from gsc.explore_lc_orbit import qubit_LC
-from gsc.graph_builders import create_prime_power_graph
+from gsc.graph_builders import create_prime_graph, create_prime_power_graph
 from gsc.utils import canonical_edge_order
 
 
@@ -26,6 +39,91 @@ def test_hash_graph():
         assert hash_graph(g) == hash_graph(relab_g)
 
 
+def test_hash_graph_stable():
+    """ Tests graph hashes are stable 128-bit digests across processes """
+    code = "import networkx as nx; from gsc.get_nauty import hash_graph; " \
+        "print(hash_graph(nx.cycle_graph(6)))"
+    hashes = set(subprocess.check_output([sys.executable, '-c', code],
+                                         env=dict(os.environ, PYTHONHASHSEED=seed))
+                 for seed in ('1', '2'))
+    assert len(hashes) == 1
+    assert int(hashes.pop()) == hash_graph(nx.cycle_graph(6))
+    assert 0 <= hash_graph(nx.cycle_graph(6)) < 2 ** 128
+
+
+def test_certificate_digest():
+    """ Tests digests distinguish certificates of non-isomorphic graphs """
+    graphs = [nx.cycle_graph(6), nx.path_graph(6), nx.star_graph(5),
+              nx.complete_graph(6)]
+    certs = [graph_certificate(g) for g in graphs]
+    assert len(set(certs)) == len(set(map(certificate_digest, certs)))
+
+
+def test_nauty_graph():
+    """ Tests direct PyNauty graphs match the layered NetworkX versions """
+    for _ in range(20):
+        prime, power = random.choice([3, 5, 7]), random.randint(2, 3)
+        g = gen_random_connected_graph(4, 0.5)
+        nodes = [(n, i) for n in g.nodes() for i in range(power)]
+        w_edges = [(random.choice(nodes), random.choice(nodes),
+                    random.randint(1, prime - 1)) for _ in range(8)]
+        w_edges = [(u, v, w) for u, v, w in w_edges if u[0] != v[0]]
+        if not w_edges:
+            continue
+        pp_g = create_prime_power_graph(w_edges, prime, power)
+        pp_g.add_nodes_from(nodes)
+        pp_g.families = 4
+        p_g = create_prime_graph(w_edges, prime)
+        for graph, partitions in ((pp_g, ['member', 'family']), (p_g, [None])):
+            for partition in partitions:
+                pyn_g, _ = nauty_graph(graph, partition)
+                nx_pyn_g, _ = convert_nx_to_pyn(graph, partition)
+                assert pyn.certificate(pyn_g) == pyn.certificate(nx_pyn_g)
+                assert pyn.autgrp(pyn_g)[3] == pyn.autgrp(nx_pyn_g)[3]
+
+
+def test_prime_power_certificate():
+    """
+    Tests prime-power certificates are invariant under permutations of the
+    families but require member and family structure to match at once
+    """
+    for _ in range(20):
+        prime, power, families = 3, 2, 4
+        nodes = [(n, i) for n in range(families) for i in range(power)]
+        w_edges = [(random.choice(nodes), random.choice(nodes),
+                    random.randint(1, prime - 1)) for _ in range(6)]
+        w_edges = [(u, v, w) for u, v, w in w_edges if u[0] != v[0]]
+        if not w_edges:
+            continue
+        pp_g = create_prime_power_graph(w_edges, prime, power)
+        perm = random.sample(range(families), families)
+        perm_edges = [((perm[u], i), (perm[v], j), w)
+                      for (u, i), (v, j), w in w_edges]
+        perm_g = create_prime_power_graph(perm_edges, prime, power)
+        for graph in (pp_g, perm_g):
+            graph.add_nodes_from(nodes)
+            graph.families = families
+        assert hash_graph(pp_g) == hash_graph(perm_g)
+    # Same member- and family-coloured graphs, but no joint isomorphism
+    e1 = [((0, 0), (1, 0), 1), ((0, 0), (1, 1), 1), ((1, 1), (2, 1), 1)]
+    e2 = [((0, 0), (1, 0), 1), ((1, 0), (2, 1), 1), ((1, 1), (2, 1), 1)]
+    g1 = create_prime_power_graph(e1, 3, 2)
+    g2 = create_prime_power_graph(e2, 3, 2)
+    for partition in ('member', 'family'):
+        assert pyn.certificate(nauty_graph(g1, partition)[0]) == \
+            pyn.certificate(nauty_graph(g2, partition)[0])
+    assert hash_graph(g1) != hash_graph(g2)
+
+
+def test_analyse_graph():
+    """ Tests analyse_graph matches separate certificate and orbit calls """
+    for _ in range(20):
+        g = gen_random_connected_graph(8, 0.3)
+        cert, node_equivs = analyse_graph(g)
+        assert cert == graph_certificate(g)
+        assert node_equivs == find_rep_nodes(g)
+
+
 def test_random_relabel():
     g = gen_random_connected_graph(10)
     relab_g = random_relabel(g)
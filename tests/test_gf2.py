@@ -0,0 +1,60 @@
+# Python packages
+import numpy as np
+import itertools as it
+# Local modules
+from gsc.gf2 import pack_rows, unpack_rows, rref, rank, nullspace, solve
+
+
+def random_matrices(count=100):
+    """ Yields random 0/1 matrices, including some wider than a word """
+    rng = np.random.RandomState(0)
+    for _ in range(count):
+        n, m = rng.randint(1, 20), rng.choice([rng.randint(1, 20),
+                                               rng.randint(60, 200)])
+        yield rng.randint(2, size=(n, m))
+
+
+def test_pack_rows():
+    """ Tests packing rows into words and back """
+    for A in random_matrices():
+        assert (unpack_rows(pack_rows(A), A.shape[1]) == A).all()
+
+
+def test_rref():
+    """ Tests rref gives the reduced row echelon form with the same span """
+    for A in random_matrices():
+        R, pivots = rref(A)
+        r = len(pivots)
+        assert rank(A) == r
+        assert not R[r:].any()
+        # Each pivot is the leading one of its row and alone in its column
+        for i, j in enumerate(pivots):
+            assert not R[i, :j].any() and R[i, j] == 1
+            assert R[:, j].sum() == 1
+        # Rows of A are combinations of the rows of R
+        assert rank(np.vstack([R[:r], A])) == r
+
+
+def test_nullspace():
+    """ Tests nullspace gives a basis of solutions of A x = 0 """
+    for A in random_matrices():
+        N = nullspace(A)
+        assert len(N) == A.shape[1] - rank(A)
+        assert not (A.dot(N.T) % 2).any()
+        if len(N):
+            assert rank(N) == len(N)
+
+
+def test_solve():
+    """ Tests solve against exhaustive search on small systems """
+    rng = np.random.RandomState(1)
+    for _ in range(100):
+        A = rng.randint(2, size=(rng.randint(1, 6), rng.randint(1, 6)))
+        b = rng.randint(2, size=A.shape[0])
+        x = solve(A, b)
+        solutions = [x for x in it.product((0, 1), repeat=A.shape[1])
+                     if (A.dot(x) % 2 == b).all()]
+        if x is None:
+            assert not solutions
+        else:
+            assert (A.dot(x) % 2 == b).all()
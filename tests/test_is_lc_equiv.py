@@ -1,10 +1,15 @@
 # Python modules
+import numpy as np
 import networkx as nx
 from random import randint
 # Local modules
 from gsc.graph_builders import random_connected_graph
 from gsc.explore_lc_orbit import apply_qubit_LCs
-from gsc.is_lc_equiv import get_adjacency_matrix, are_lc_equiv
+from gsc.is_lc_equiv import (
+    get_adjacency_matrix,
+    lc_equiv_system,
+    are_lc_equiv,
+)
 
 
 def test_is_lc_equiv():
@@ -31,3 +36,27 @@ def test_get_adjacency_matrix():
         nx_adj_mat = nx.to_numpy_array(graph, nodelist=nodes, dtype=int)
         assert nodes == key
         assert test_adj_mat.tolist() == nx_adj_mat.tolist()
+
+
+def test_lc_equiv_system():
+    """ Tests lc_equiv_system against S1^T Q^T P S2 for random Q """
+    n = 8
+    for _ in range(100):
+        am1, _ = get_adjacency_matrix(random_connected_graph(n))
+        am2, _ = get_adjacency_matrix(random_connected_graph(n))
+        abcd = np.random.randint(2, size=4 * n)
+        A, B, C, D = [np.diag(abcd[i::4]) for i in range(4)]
+        X = am1.dot(A) + am1.dot(C).dot(am2) + B + D.dot(am2)
+        assert (lc_equiv_system(am1, am2).dot(abcd) % 2 ==
+                X.reshape(-1) % 2).all()
+
+
+def test_large_is_lc_equiv():
+    """ Tests is_lc_equiv on larger graphs """
+    n, lcs = 30, 30
+    graph_init = random_connected_graph(n)
+    graph_fin = apply_qubit_LCs(graph_init,
+                                [randint(0, n - 1) for _ in range(lcs)])
+    assert are_lc_equiv(graph_init, graph_fin)[0]
+    # Paths are not LC-equivalent to stars (nor complete graphs)
+    assert not are_lc_equiv(nx.path_graph(n), nx.star_graph(n - 1))[0]
@@ -0,0 +1,49 @@
+# Python packages
+import random
+import networkx as nx
+# Local modules
+from gsc.bit_graphs import to_bit_graph
+from gsc.graph_builders import create_prime_graph
+from gsc.member_codes import (
+    pack_bit_graph,
+    unpack_bit_graph,
+    pack_weights,
+    unpack_weights,
+    MemberCodec,
+    MemberData,
+)
+
+
+def test_bit_graph_codes():
+    """ Tests packing and unpacking bit graphs """
+    for _ in range(100):
+        n = random.randint(2, 15)
+        g = nx.fast_gnp_random_graph(n, 0.4)
+        bit_g = to_bit_graph(g)
+        assert unpack_bit_graph(pack_bit_graph(bit_g), n) == bit_g
+
+
+def test_weight_codes():
+    """ Tests packing and unpacking weighted graphs """
+    for _ in range(100):
+        n, prime = random.randint(2, 10), random.choice([3, 5, 7])
+        nodes = list(range(n))
+        w_edges = [(u, v, random.randint(1, prime - 1))
+                   for u, v in nx.fast_gnp_random_graph(n, 0.4).edges()]
+        g = nx.Graph()
+        g.add_nodes_from(nodes)
+        g.add_weighted_edges_from(w_edges)
+        assert unpack_weights(pack_weights(g, nodes), nodes) == w_edges
+
+
+def test_member_data():
+    """ Tests compact member data rebuilds lazy attributes """
+    g = create_prime_graph([(0, 1, 1), (1, 2, 2)], 3)
+    codec = MemberCodec(g, False)
+    data = MemberData(codec, codec.encode(g))
+    data.update(hash=0)
+    assert data['edges'] == [(0, 1, 1), (1, 2, 2)]
+    assert data['nx_graph'].prime == 3
+    assert set(data) == {'hash', 'edges', 'nx_graph'}
+    data.pop('nx_graph')
+    assert dict(data.items()) == {'hash': 0, 'edges': [(0, 1, 1), (1, 2, 2)]}
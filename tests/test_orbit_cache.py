@@ -0,0 +1,62 @@
+# Python packages
+import pytest
+import networkx as nx
+# Local modules
+from gsc.orbit_cache import OrbitCache
+from gsc.explore_lc_orbit import explore_lc_orbit
+from gsc.graph_builders import create_prime_graph
+
+
+def test_cached_explore_lc_orbit(tmp_path):
+    """ Tests cached orbits are returned relabelled to the input graph """
+    cache = OrbitCache(str(tmp_path / 'orbits.sqlite'))
+    for g in (nx.cycle_graph(6),
+              create_prime_graph([(0, 1, 1), (1, 2, 2), (2, 3, 1)], 3)):
+        class_graph = explore_lc_orbit(g, verbose=False, cache=cache)
+        assert cache.find(g) == (len(cache), 0)
+        # Relabels an LC-equivalent member of the orbit
+        member = class_graph.nodes[len(class_graph) - 1]['nx_graph']
+        relabel = {node: 'q%d' % node for node in member.nodes()}
+        other = nx.relabel_nodes(member, relabel)
+        other.__dict__.update({attr: member.__dict__[attr]
+                               for attr in ('prime', 'power', 'dimension')
+                               if attr in member.__dict__})
+        cached_class_graph = explore_lc_orbit(other, verbose=False,
+                                              cache=cache)
+        assert sorted(cached_class_graph.nodes[0]['nx_graph']
+                      .edges(data='weight')) == \
+            sorted(other.edges(data='weight'))
+        # Compares against a fresh search of the relabelled member
+        other_class_graph = explore_lc_orbit(other, verbose=False)
+        assert cached_class_graph.nodes[0]['hash'] == \
+            other_class_graph.nodes[0]['hash']
+        assert set(cached_class_graph.member_hash_table) == \
+            set(other_class_graph.member_hash_table)
+        assert nx.is_isomorphic(cached_class_graph, other_class_graph)
+        assert all(node in other for _, _, equivs
+                   in cached_class_graph.edges(data='equivs')
+                   for equiv_nodes in equivs for node in equiv_nodes)
+    cache.close()
+
+
+def test_orbit_cache_eviction(tmp_path):
+    """ Tests the least recently used orbits are evicted first """
+    path = str(tmp_path / 'orbits.sqlite')
+    cache = OrbitCache(path)
+    graphs = [nx.cycle_graph(n) for n in (5, 6, 7)]
+    for g in graphs:
+        explore_lc_orbit(g, verbose=False, cache=cache)
+    sizes = cache.size()
+    cache.close()
+    # Uses C5's orbit so that C6's is the least recently used
+    cache = OrbitCache(path, max_bytes=sizes - 1)
+    assert cache.get(graphs[0]) is not None
+    explore_lc_orbit(nx.star_graph(3), verbose=False, cache=cache)
+    assert cache.find(graphs[1]) is None
+    assert all(cache.find(g) is not None for g in (graphs[0], graphs[2]))
+    assert cache.size() <= sizes - 1
+    with pytest.raises(ValueError):
+        explore_lc_orbit(graphs[0], verbose=False, compact=True, cache=cache)
+    with pytest.raises(ValueError):
+        explore_lc_orbit(graphs[0], verbose=False, census=True, cache=cache)
+    cache.close()
@@ -0,0 +1,35 @@
+# Python packages
+import pytest
+import networkx as nx
+# Local modules
+from gsc.orbit_sampling import sample_lc_orbit
+from gsc.explore_lc_orbit import explore_lc_orbit
+from gsc.graph_builders import create_prime_graph, create_prime_power_graph
+
+
+def test_sample_lc_orbit():
+    """ Tests sampled size estimates match explored qubit and qudit orbits """
+    for g in (nx.cycle_graph(7),
+              create_prime_graph([(0, 1, 1), (1, 2, 2), (2, 3, 1)], 5)):
+        class_graph = explore_lc_orbit(g, verbose=False)
+        size = class_graph.number_of_nodes()
+        min_edges = min(len(edges) for _, edges
+                        in class_graph.nodes(data='edges'))
+        estimate = sample_lc_orbit(g, n_samples=500, seed=0)
+        assert estimate['distinct'] <= size
+        low, high = estimate['size_interval']
+        assert low <= size <= high
+        assert abs(estimate['size'] - size) < 0.25 * size
+        assert sum(estimate['edge_distribution'].values()) == \
+            pytest.approx(1)
+        assert all(rep.number_of_edges() >= min_edges
+                   for rep in estimate['min_edge_reps'])
+
+
+def test_sample_lc_orbit_no_collisions():
+    """ Tests large orbits give unbounded estimates without collisions """
+    estimate = sample_lc_orbit(nx.cycle_graph(24), n_samples=50, seed=0)
+    assert estimate['collisions'] == 0
+    assert estimate['size_interval'] == (50, float('inf'))
+    with pytest.raises(ValueError):
+        sample_lc_orbit(create_prime_power_graph([((0, 0), (1, 0), 1)], 2, 2))
@@ -0,0 +1,70 @@
+# Python packages
+import pytest
+import networkx as nx
+# Local modules
+from gsc.bit_graphs import to_bit_graph, bit_qubit_LC
+from gsc.member_codes import MemberCodec
+from gsc.explore_lc_orbit import (
+    explore_lc_orbit,
+    stored_orbit_search,
+    load_class_graph,
+)
+
+
+def test_stored_explore_lc_orbit(tmp_path):
+    """ Tests disk-backed orbit search returns the in-memory class graph """
+    g = nx.cycle_graph(7)
+    class_graph = explore_lc_orbit(g, verbose=False)
+    directory = str(tmp_path / 'C7')
+    for _ in range(2):
+        stored_class_graph = explore_lc_orbit(g, verbose=False,
+                                              directory=directory)
+        assert_same_class_graph(class_graph, stored_class_graph)
+
+
+def test_resume_stored_orbit_search(tmp_path):
+    """ Tests an interrupted disk-backed search resumes from checkpoint """
+    g = nx.cycle_graph(7)
+    class_graph = explore_lc_orbit(g, verbose=False)
+    directory = str(tmp_path / 'C7')
+    codec = MemberCodec(g, True)
+    bit_g = to_bit_graph(g)
+    calls = []
+
+    def crashing_LC(graph, node):
+        calls.append(node)
+        if len(calls) > 50:
+            raise RuntimeError("Crashed")
+        return bit_qubit_LC(graph, node)
+
+    with pytest.raises(RuntimeError):
+        stored_orbit_search(bit_g, [('LC', crashing_LC)], True, False, codec,
+                            directory, checkpoint_every=5)
+    store = stored_orbit_search(bit_g, [('LC', bit_qubit_LC)], True, False,
+                                codec, directory, checkpoint_every=5)
+    resumed_class_graph = load_class_graph(store, codec)
+    store.close()
+    for node, data in resumed_class_graph.nodes(data=True):
+        assert data['graph'] == to_bit_graph(class_graph.nodes[node]['nx_graph'])
+    assert sorted(resumed_class_graph.edges()) == sorted(class_graph.edges())
+
+
+def test_stored_orbit_search_mismatch(tmp_path):
+    """ Tests a store cannot be resumed by a different search """
+    directory = str(tmp_path / 'orbit')
+    explore_lc_orbit(nx.cycle_graph(5), verbose=False, directory=directory)
+    with pytest.raises(ValueError):
+        explore_lc_orbit(nx.path_graph(5), verbose=False, directory=directory)
+    with pytest.raises(ValueError):
+        explore_lc_orbit(nx.cycle_graph(5), verbose=False, directory=directory,
+                         verify=True)
+
+
+def assert_same_class_graph(class_graph, other_class_graph):
+    assert dict(class_graph.nodes(data='edges')) == \
+        dict(other_class_graph.nodes(data='edges'))
+    edges = sorted((min(u, v), max(u, v), ops)
+                   for u, v, ops in class_graph.edges(data='ops'))
+    other_edges = sorted((min(u, v), max(u, v), ops)
+                         for u, v, ops in other_class_graph.edges(data='ops'))
+    assert edges == other_edges
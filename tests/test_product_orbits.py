@@ -0,0 +1,61 @@
+# Python packages
+import networkx as nx
+from collections import Counter
+# Local modules
+from gsc.get_nauty import hash_graph
+from gsc.bit_graphs import to_bit_graph, bit_qubit_LC
+from gsc.qudit_graphs import QuditGraph, qudit_LC_EM_children
+from gsc.graph_builders import create_prime_graph
+from gsc.explore_lc_orbit import explore_lc_orbit, queued_orbit_search
+
+
+def test_qubit_product_orbit():
+    """ Tests product orbits match searching the disconnected graph """
+    g = nx.disjoint_union_all([nx.path_graph(4), nx.star_graph(3),
+                               nx.cycle_graph(4), nx.path_graph(3),
+                               nx.path_graph(1)])
+    product_orbit = explore_lc_orbit(g, verbose=False)
+    # P4 and C4 share an orbit, so are only explored once
+    assert [len(relabels) for _, relabels in product_orbit.factors] == \
+        [2, 1, 1, 1]
+    class_graph = queued_orbit_search(to_bit_graph(g, list(g.nodes())),
+                                      [('LC', bit_qubit_LC)], False, False)
+    assert_same_orbit(product_orbit, class_graph)
+
+
+def test_prime_product_orbit():
+    """ Tests prime product orbits match searching the disconnected graph """
+    g = create_prime_graph([(0, 1, 1), (1, 2, 2), (3, 4, 1), (4, 5, 1),
+                            (6, 7, 2), (8, 9, 1), (9, 10, 2)], 3)
+    product_orbit = explore_lc_orbit(g, verbose=False)
+    assert [len(relabels) for _, relabels in product_orbit.factors] == [3, 1]
+    class_graph = queued_orbit_search(
+        QuditGraph.from_nx(g), [(('LC1', 'LC2', 'EM2'), qudit_LC_EM_children)],
+        False, False)
+    assert_same_orbit(product_orbit, class_graph)
+
+
+def test_isolated_vertex_product_orbit():
+    """ Tests product orbits of prime graphs with isolated vertices """
+    g = create_prime_graph([(0, 1, 1), (1, 2, 2)], 3)
+    g.add_node(3)
+    product_orbit = explore_lc_orbit(g, verbose=False)
+    assert [len(relabels) for _, relabels in product_orbit.factors] == [1, 1]
+    class_graph = queued_orbit_search(
+        QuditGraph.from_nx(g), [(('LC1', 'LC2', 'EM2'), qudit_LC_EM_children)],
+        False, False)
+    assert_same_orbit(product_orbit, class_graph)
+
+
+def assert_same_orbit(product_orbit, class_graph):
+    members = list(product_orbit.members())
+    assert product_orbit.size() == len(members) == len(class_graph)
+    assert set(map(hash_graph, members)) == \
+        set(class_graph.member_hash_table)
+    edge_counts = Counter(member.number_of_edges() for member in members)
+    assert product_orbit.edge_counts() == dict(edge_counts)
+    for reps, n_edges in ((product_orbit.min_edge_reps(), min(edge_counts)),
+                          (product_orbit.max_edge_reps(), max(edge_counts))):
+        reps = list(reps)
+        assert len(reps) == edge_counts[n_edges]
+        assert all(rep.number_of_edges() == n_edges for rep in reps)
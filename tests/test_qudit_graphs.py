@@ -0,0 +1,146 @@
+# Python packages
+import random
+import numpy as np
+import networkx as nx
+# Local modules
+from gsc.graph_builders import (
+    create_prime_graph,
+    create_prime_power_graph,
+    random_connected_graph,
+)
+from gsc.get_nauty import hash_graph, find_rep_nodes
+from gsc.is_lc_equiv import get_adjacency_matrix, are_lc_equiv
+from gsc.explore_lc_orbit import (
+    prime_qudit_LC,
+    prime_qudit_EM,
+    prime_power_qudit_CC,
+    explore_lc_orbit,
+)
+from gsc.qudit_graphs import (
+    QuditGraph,
+    qudit_LC_EM_children,
+    qudit_CC_EM_children,
+)
+
+
+def test_qudit_graph_round_trip():
+    """ Tests converting to and from QuditGraphs preserves the graph """
+    g = create_prime_power_graph([((0, 0), (1, 0), 1), ((1, 1), (2, 0), 2)],
+                                 3, 2)
+    q_g = QuditGraph.from_nx(g)
+    assert (q_g.prime, q_g.power, q_g.dimension, q_g.families) == (3, 2, 9, 3)
+    assert q_g.number_of_edges() == g.number_of_edges()
+    rt_g = q_g.to_nx()
+    assert list(rt_g.nodes()) == list(g.nodes())
+    assert sorted(rt_g.edges(data='weight')) == \
+        sorted(g.edges(data='weight'))
+    assert (rt_g.prime, rt_g.power, rt_g.families) == (3, 2, 3)
+
+
+def test_qudit_graph_copy():
+    """ Tests copies share node data but not weights """
+    q_g = QuditGraph.from_nx(create_prime_graph([(0, 1, 1), (1, 2, 2)], 3))
+    q_g_copy = q_g.copy()
+    q_g_copy.weights[0, 2] = q_g_copy.weights[2, 0] = 1
+    assert q_g_copy.nodes is q_g.nodes
+    assert q_g.weights[0, 2] == 0
+    assert q_g.key() != q_g_copy.key()
+
+
+def test_qudit_local_ops():
+    """ Tests QuditGraph local operations against the NetworkX versions """
+    for _ in range(50):
+        p = random.choice([3, 5, 7])
+        g = gen_random_prime_graph(8, p)
+        q_g = QuditGraph.from_nx(g)
+        i = random.choice(range(8))
+        node, a = q_g.nodes[i], random.randrange(1, p)
+        assert same_graph(prime_qudit_LC(q_g, i, a),
+                          prime_qudit_LC(g, node, a))
+        assert same_graph(prime_qudit_EM(q_g, i, a),
+                          prime_qudit_EM(g, node, a))
+    g = create_prime_power_graph([((0, 0), (1, 0), 1), ((0, 1), (2, 1), 2),
+                                  ((1, 1), (2, 0), 1)], 3, 2)
+    q_g = QuditGraph.from_nx(g)
+    for i, node in enumerate(g.nodes()):
+        for t, a in [(0, 1), (1, 2)]:
+            assert same_graph(prime_power_qudit_CC(q_g, i, t, a),
+                              prime_power_qudit_CC(g, node, t, a))
+
+
+def test_qudit_LC_EM_children():
+    """ Tests batched LC_a and EM_b children match the single ops """
+    for _ in range(20):
+        p = random.choice([3, 5, 7])
+        q_g = QuditGraph.from_nx(gen_random_prime_graph(8, p))
+        i = random.choice(range(8))
+        children = [prime_qudit_LC(q_g, i, a) for a in range(1, p)]
+        children += [prime_qudit_EM(q_g, i, b) for b in range(2, p)]
+        assert child_keys(q_g, qudit_LC_EM_children(q_g, i)) == \
+            [child.key() for child in children]
+
+
+def test_qudit_CC_EM_children():
+    """ Tests batched CC_a,t and EM_b children match the single ops """
+    for p, m in [(2, 2), (3, 2), (3, 3)]:
+        g = create_prime_power_graph([((0, 0), (1, 0), 1),
+                                      ((0, 1), (2, 1), p - 1),
+                                      ((1, 1), (2, 0), 1)], p, m)
+        q_g = QuditGraph.from_nx(g)
+        for i, node in enumerate(q_g.nodes):
+            children = [prime_power_qudit_CC(q_g, i, t, a)
+                        for a in range(1, p) for t in range(m)]
+            children += [prime_qudit_EM(q_g, i, b) for b in range(2, p)]
+            assert child_keys(q_g, qudit_CC_EM_children(q_g, i)) == \
+                [child.key() for child in children]
+
+
+def test_qudit_graph_nauty():
+    """ Tests QuditGraph hashes and orbits match the NetworkX versions """
+    for _ in range(50):
+        g = gen_random_prime_graph(8, 5)
+        q_g = QuditGraph.from_nx(g)
+        assert hash_graph(q_g) == hash_graph(g)
+        nodes = list(g.nodes())
+        assert {nodes[u]: [nodes[v] for v in equivs]
+                for u, equivs in find_rep_nodes(q_g).items()} == \
+            find_rep_nodes(g)
+
+
+def test_qudit_graph_is_lc_equiv():
+    """ Tests is_lc_equiv accepts QuditGraphs """
+    g = random_connected_graph(6)
+    q_g = QuditGraph.from_nx(g)
+    assert np.array_equal(get_adjacency_matrix(q_g)[0],
+                          get_adjacency_matrix(g)[0])
+    assert are_lc_equiv(q_g, g)[0]
+
+
+def test_qudit_graph_explore_lc_orbit():
+    """ Tests explore_lc_orbit accepts QuditGraphs """
+    g = create_prime_graph([(0, 1, 1), (1, 2, 2)], 3)
+    class_graph = explore_lc_orbit(QuditGraph.from_nx(g), verbose=False)
+    assert class_graph.number_of_nodes() == \
+        explore_lc_orbit(g, verbose=False).number_of_nodes()
+
+
+def child_keys(q_g, children):
+    """ Returns the keys of batched children, where None means q_g itself """
+    return [q_g.key() if child is None else child.key()
+            for child in children]
+
+
+def same_graph(q_g, g):
+    """ Checks a QuditGraph has the same weighted edges as a NetworkX graph """
+    def edge_set(edges):
+        return sorted((min(u, v), max(u, v), w) for u, v, w in edges)
+    return edge_set(q_g.edges()) == edge_set(g.edges(data='weight'))
+
+
+def gen_random_prime_graph(n, p, prob=0.5):
+    """ Generates a random connected prime-weighted graph """
+    g = nx.fast_gnp_random_graph(n, prob)
+    while not nx.is_connected(g):
+        g = nx.fast_gnp_random_graph(n, prob)
+    return create_prime_graph([(u, v, random.randrange(1, p))
+                               for u, v in g.edges()], p)
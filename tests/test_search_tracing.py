@@ -0,0 +1,53 @@
+# Python packages
+import io
+import json
+import networkx as nx
+# Local modules
+from gsc.explore_lc_orbit import explore_lc_orbit
+from gsc.search_tracing import (
+    SearchMetrics,
+    SearchTracer,
+    JSONLTracer,
+    profile_search,
+)
+
+
+def test_search_metrics():
+    """ Tests search metrics count every member and child """
+    metrics = SearchMetrics()
+    class_graph = explore_lc_orbit(nx.cycle_graph(7), verbose=False,
+                                   metrics=metrics)
+    counts = metrics.counts
+    assert counts['expanded'] == len(class_graph)
+    assert counts['dedup_misses'] == len(class_graph) - 1
+    assert counts['children'] == counts['noop_children'] + \
+        counts['inverse_children'] + counts['dedup_hits'] + \
+        counts['dedup_misses']
+    assert counts['certificates'] + counts['cert_cache_hits'] == \
+        counts['dedup_hits'] + counts['dedup_misses']
+    assert set(metrics.times) == {'orbits', 'children', 'certificates'}
+
+
+def test_search_tracers():
+    """ Tests tracers receive rate-limited progress events """
+    events = []
+    explore_lc_orbit(nx.cycle_graph(7), verbose=False,
+                     tracer=SearchTracer(events.append, interval=3600))
+    assert [event['event'] for event in events] == ['start', 'finish']
+    assert events[-1]['visited'] == events[-1]['known']
+    stream = io.StringIO()
+    explore_lc_orbit(nx.cycle_graph(7), verbose=False, metrics=SearchMetrics(),
+                     tracer=JSONLTracer(stream, interval=0))
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [event['event'] for event in events[1:-1]] == \
+        ['progress'] * events[-1]['known']
+    assert events[-1]['counts']['expanded'] == events[-1]['known']
+
+
+def test_profile_search():
+    """ Tests profiling a search collects call stats and peak memory """
+    with profile_search() as profile:
+        explore_lc_orbit(nx.cycle_graph(6), verbose=False)
+    assert any(func[2] == 'explore_lc_orbit'
+               for func in profile['stats'].stats)
+    assert profile['peak_memory'] > 0
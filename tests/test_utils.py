@@ -0,0 +1,15 @@
+# Local modules
+from gsc.utils import LRUCache
+
+
+def test_lru_cache():
+    """ Tests the LRU cache evicts its least recently used item """
+    cache = LRUCache(2)
+    cache['a'], cache['b'] = 1, 2
+    assert cache.get('a') == 1
+    cache['c'] = 3
+    assert list(cache) == ['a', 'c']
+    assert cache.get('b') is None
+    cache['a'] = 4
+    cache['d'] = 5
+    assert dict(cache) == {'a': 4, 'd': 5}